@@ -31,59 +31,100 @@ __version__ = "1.0.0"
 __author__ = "Bank of England ETL Team"
 __email__ = "etl-team@bankofengland.co.uk"
 
-# Import main classes for easy access
-__all__ = ['__version__', '__author__', '__email__']
+import importlib
+import threading
+from typing import TYPE_CHECKING
+
+# Main classes are imported on first access (PEP 562) so that ``import boe_etl``
+# does not pull in PDF, Excel and NLP dependencies the caller may never use.
+_LAZY = {
+    'ETLPipeline': ('.etl_pipeline', 'ETLPipeline'),
+    'SchemaTransformer': ('.schema_transformer', 'SchemaTransformer'),
+    'PDFParser': ('.parsers.pdf_parser', 'PDFParser'),
+    'ExcelParser': ('.parsers.excel_parser', 'ExcelParser'),
+    'TextParser': ('.parsers.text_parser', 'TextParser'),
+    'JSONParser': ('.parsers.json_parser', 'JSONParser'),
+    'NLPProcessor': ('.nlp', 'NLPProcessor'),
+}
 
-try:
-    from .etl_pipeline import ETLPipeline
-    __all__.append('ETLPipeline')
-except ImportError:
-    pass
+# Alternative modules tried when the primary import fails
+_FALLBACKS = {
+    'ETLPipeline': ('.core', 'ETLPipeline'),
+}
 
-try:
-    from .schema_transformer import SchemaTransformer
-    __all__.append('SchemaTransformer')
-except ImportError:
-    pass
+# ``__all__`` is not defined up front: like the eager imports it replaces, it is
+# built on first use (e.g. ``from boe_etl import *``) from the classes whose
+# optional dependencies are installed
+_METADATA = ['__version__', '__author__', '__email__']
 
-try:
+if TYPE_CHECKING:
+    from .etl_pipeline import ETLPipeline
+    from .schema_transformer import SchemaTransformer
     from .parsers.pdf_parser import PDFParser
-    __all__.append('PDFParser')
-except ImportError:
-    pass
-
-try:
     from .parsers.excel_parser import ExcelParser
-    __all__.append('ExcelParser')
-except ImportError:
-    pass
-
-try:
     from .parsers.text_parser import TextParser
-    __all__.append('TextParser')
-except ImportError:
-    pass
-
-try:
     from .parsers.json_parser import JSONParser
-    __all__.append('JSONParser')
-except ImportError:
-    pass
-
-try:
     from .nlp import NLPProcessor
-    __all__.append('NLPProcessor')
-except ImportError:
-    pass
 
-# Alternative import for core ETLPipeline if direct import fails
-if 'ETLPipeline' not in __all__:
+def _importable_names():
+    """List the metadata names plus every main class that imports cleanly."""
+    names = list(_METADATA)
+    for name in _LAZY:
+        try:
+            __getattr__(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+def __getattr__(name):
+    """Import main classes on first access."""
+    if name == '__all__':
+        names = _importable_names()
+        globals()['__all__'] = names
+        return names
+    
+    spec = _LAZY.get(name)
+    if spec is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
     try:
-        from .core import ETLPipeline
-        __all__.append('ETLPipeline')
+        module = importlib.import_module(spec[0], __name__)
     except ImportError:
-        import warnings
-        warnings.warn("ETLPipeline could not be imported. Use direct module imports instead.")
+        if name not in _FALLBACKS:
+            raise
+        spec = _FALLBACKS[name]
+        module = importlib.import_module(spec[0], __name__)
+    
+    obj = getattr(module, spec[1])
+    globals()[name] = obj
+    return obj
+
+def __dir__():
+    """Include lazily imported classes in ``dir(boe_etl)``."""
+    return sorted(set(globals()) | set(_LAZY))
+
+def _warm_quarter_patterns():
+    """Compile the quarter filename patterns while the caller keeps importing."""
+    try:
+        from .utils import quarter_utils
+        quarter_utils._ensure_quarter_patterns()
+    except Exception:
+        # Any failure is raised again when quarter_utils is imported for real
+        pass
+
+def warm_up():
+    """
+    Start compiling the quarter filename patterns on a background thread.
+    
+    Opt-in for long-running callers: ``import boe_etl`` itself starts no
+    threads and writes no files, and the patterns are otherwise compiled on
+    first use. Call this before any custom ``load_quarter_patterns()``.
+    Returns the started daemon thread.
+    """
+    thread = threading.Thread(target=_warm_quarter_patterns, name='boe_etl-warmup', daemon=True)
+    thread.start()
+    return thread
 
 # Package metadata
 PACKAGE_INFO = {
@@ -15,18 +15,38 @@ import sqlite3
 import argparse
 import logging
 import time
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 import pdfplumber
 from nltk.tokenize import sent_tokenize
 from nltk.tokenize import word_tokenize
 import pyarrow as pa
-from typing import List, Dict, Optional, Tuple
+import pyarrow.parquet as pq
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 import json
 from urllib.parse import urlparse
+try:
+    import pymupdf as fitz
+except ImportError:
+    try:
+        import fitz
+    except ImportError:
+        fitz = None
+if fitz is not None:
+    # Text-only extraction: keep MuPDF quiet and leave images out of page output
+    fitz.TOOLS.mupdf_display_errors(False)
+    PDF_TEXT_FLAGS = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_IMAGES
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
 try:
     from retry import retry
 except ImportError:
@@ -50,9 +70,12 @@ RAW_DIR = Path(os.getenv("RAW_DATA_DIR", "data/raw"))
 CLEAN_DIR = Path(os.getenv("PROCESSED_DATA_DIR", "data/processed"))
 DB_PATH = Path(os.getenv("DB_PATH", "db/earnings.db"))
 LOG_PATH = Path(os.getenv("LOG_PATH", "logs/etl.log"))
-PARQUET_OPT = {"engine": "pyarrow", "compression": "snappy"}
+PARQUET_OPT = {"compression": "zstd", "compression_level": 3}
 MAX_RETRIES = 3
 RETRY_DELAY = 5  # seconds
+DEFAULT_WORKERS = min(os.cpu_count() or 1, 8)
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # bytes
+REGISTER_BATCH_SIZE = 1000  # catalog rows buffered per worker before a flush
 
 # Set up logging
 logging.basicConfig(
@@ -61,6 +84,19 @@ logging.basicConfig(
     format="%(asctime)s %(levelname)s %(message)s"
 )
 
+def _class_xpath(tag: str, css_class: str) -> str:
+    """XPath matching descendant tags whose class list contains css_class"""
+    return f".//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]"
+
+# HTML transcript selectors, compiled once
+if LXML_AVAILABLE:
+    _BLOCK_XPATH = etree.XPath(_class_xpath('div', 'speaker-block'))
+    _NAME_XPATH = etree.XPath(_class_xpath('span', 'speaker-name'))
+    _TIMESTAMP_XPATH = etree.XPath(_class_xpath('span', 'timestamp'))
+    _CONTENT_XPATH = etree.XPath(_class_xpath('div', 'content'))
+    # Transcripts are read as UTF-8 whatever their <?xml ...?> or <meta> declaration says
+    _HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
 class ETLException(Exception):
     """Base exception for ETL pipeline errors"""
     pass
@@ -77,6 +113,29 @@ class DatabaseError(ETLException):
     """Error during database operations"""
     pass
 
+@dataclass
+class Sentence:
+    """Sentence-level record produced by clean_and_split"""
+    # Slotted: millions of these flow through a run, so skip the per-instance dict
+    __slots__ = ('speaker_norm', 'timestamp_epoch', 'timestamp_iso', 'sentence_id', 'text')
+    speaker_norm: str
+    timestamp_epoch: int
+    timestamp_iso: str
+    sentence_id: str
+    text: str
+
+# Output schema for sentence-level Parquet files
+PARQUET_SCHEMA = pa.schema([
+    ('speaker_norm', pa.string()),
+    ('timestamp_epoch', pa.int64()),
+    ('timestamp_iso', pa.string()),
+    ('sentence_id', pa.string()),
+    ('text', pa.string()),
+    ('bank', pa.string()),
+    ('quarter', pa.string()),
+    ('call_id', pa.string())
+])
+
 def validate_bank_name(bank: str) -> bool:
     """Validate bank name format"""
     if not bank or not isinstance(bank, str):
@@ -97,28 +156,124 @@ def validate_quarter(quarter: str) -> bool:
         raise ValueError("Quarter must be in format QX_YYYY")
     return True
 
+# Long-lived catalog connection, opened lazily once per process
+_CONN: Optional[sqlite3.Connection] = None
+_CONN_PID: Optional[int] = None
+_CONN_LOCK = threading.Lock()
+
+# Connections inherited from a parent process; they stay referenced so they are
+# never closed or garbage-collected in the child, which SQLite forbids after fork
+_INHERITED_CONNS: List[sqlite3.Connection] = []
+
+_INSERT_CALL_SQL = '''
+    INSERT OR REPLACE INTO calls 
+    (call_id, bank_name, quarter, source_url, source_type, 
+     processed_at, status, error_message)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def _get_connection() -> sqlite3.Connection:
+    """
+    Return this process's catalog connection, opening it on first use.
+    Must be called with _CONN_LOCK held. Connections are never shared
+    across processes, since SQLite handles are not fork-safe.
+    """
+    global _CONN, _CONN_PID
+    if _CONN is None or _CONN_PID != os.getpid():
+        if _CONN is not None:
+            _INHERITED_CONNS.append(_CONN)
+        _CONN = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+        _CONN.execute("PRAGMA journal_mode=WAL")
+        _CONN.execute("PRAGMA synchronous=NORMAL")
+        _CONN_PID = os.getpid()
+    return _CONN
+
+def close_connection() -> None:
+    """Close this process's catalog connection if one is open"""
+    global _CONN, _CONN_PID
+    with _CONN_LOCK:
+        if _CONN is not None:
+            if _CONN_PID == os.getpid():
+                _CONN.close()
+            else:
+                _INHERITED_CONNS.append(_CONN)
+        _CONN = None
+        _CONN_PID = None
+
+def _forget_inherited_connection() -> None:
+    """Drop the parent's connection in a forked child without closing it"""
+    global _CONN, _CONN_PID, _CONN_LOCK
+    if _CONN is not None:
+        _INHERITED_CONNS.append(_CONN)
+    _CONN = None
+    _CONN_PID = None
+    # Another parent thread may have held the lock at fork time
+    _CONN_LOCK = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_inherited_connection)
+
 def initialize_database() -> None:
     """Create database tables if they don't exist"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS calls (
-                call_id TEXT PRIMARY KEY,
-                bank_name TEXT NOT NULL,
-                quarter TEXT NOT NULL,
-                source_url TEXT,
-                source_type TEXT,
-                processed_at TIMESTAMP,
-                status TEXT,
-                error_message TEXT
-            )
-        ''')
-        conn.commit()
-        conn.close()
+        with _CONN_LOCK:
+            _get_connection().execute('''
+                CREATE TABLE IF NOT EXISTS calls (
+                    call_id TEXT PRIMARY KEY,
+                    bank_name TEXT NOT NULL,
+                    quarter TEXT NOT NULL,
+                    source_url TEXT,
+                    source_type TEXT,
+                    processed_at TIMESTAMP,
+                    status TEXT,
+                    error_message TEXT
+                )
+            ''')
     except sqlite3.Error as e:
         raise DatabaseError(f"Failed to initialize database: {e}")
 
+def _call_row(
+    call_id: str,
+    bank: str,
+    quarter: str,
+    source_url: str,
+    source_type: str,
+    status: str = "success",
+    error_message: Optional[str] = None
+) -> Tuple:
+    """Build a calls table row, stamped with the current time"""
+    return (
+        call_id,
+        bank,
+        quarter,
+        source_url,
+        source_type,
+        datetime.now(),
+        status,
+        error_message
+    )
+
+def register_call_batch(rows: List[Tuple]) -> None:
+    """
+    Register many calls in one transaction.
+    Each row is (call_id, bank, quarter, source_url, source_type,
+    processed_at, status, error_message).
+    """
+    if not rows:
+        return
+    try:
+        with _CONN_LOCK:
+            conn = _get_connection()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(_INSERT_CALL_SQL, rows)
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+    except sqlite3.Error as e:
+        raise DatabaseError(f"Failed to register calls: {e}")
+
 def register_call(
     call_id: str,
     bank: str,
@@ -129,37 +284,21 @@ def register_call(
     error_message: Optional[str] = None
 ) -> None:
     """Register a call in the database with status tracking"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.execute('''
-            INSERT OR REPLACE INTO calls 
-            (call_id, bank_name, quarter, source_url, source_type, 
-             processed_at, status, error_message)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            call_id,
-            bank,
-            quarter,
-            source_url,
-            source_type,
-            datetime.now(),
-            status,
-            error_message
-        ))
-        conn.commit()
-        conn.close()
-    except sqlite3.Error as e:
-        raise DatabaseError(f"Failed to register call: {e}")
+    register_call_batch([
+        _call_row(call_id, bank, quarter, source_url, source_type, status, error_message)
+    ])
 
 @retry(FetchError, tries=MAX_RETRIES, delay=RETRY_DELAY)
 def fetch_asset(url: str, output_path: Path) -> None:
     """Download an asset with retry logic"""
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'wb') as f:
-            f.write(response.content)
+        # Stream to disk so large filings never sit fully in memory
+        with requests.get(url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
         logging.info(f"Successfully downloaded {url} to {output_path}")
     except requests.RequestException as e:
         raise FetchError(f"Failed to fetch {url}: {e}")
@@ -200,58 +339,97 @@ def fetch_assets(bank: str, quarter: str) -> List[Path]:
     
     return assets
 
+def _pdf_page_texts(path: Path) -> Iterator[str]:
+    """Yield the line-joined text of each PDF page"""
+    if fitz is not None:
+        with fitz.open(path) as doc:
+            for page in doc:
+                yield page.get_text("text", flags=PDF_TEXT_FLAGS)
+    else:
+        with pdfplumber.open(path) as pdf:
+            for page in pdf.pages:
+                yield page.extract_text()
+
 def parse_pdf(path: Path) -> List[Dict[str, str]]:
     """
     Parse a PDF transcript or presentation.
+    Uses PyMuPDF when installed, otherwise pdfplumber.
     Returns a list of dicts: {speaker, timestamp, text}
     """
     try:
         records = []
-        with pdfplumber.open(path) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if not text:
-                    continue
-                    
-                # Split text into speaker blocks
-                blocks = text.split('\n\n')
-                for block in blocks:
-                    # Simple speaker detection (improve as needed)
-                    if ':' in block:
-                        speaker, content = block.split(':', 1)
-                        records.append({
-                            'speaker': speaker.strip(),
-                            'timestamp': datetime.now().isoformat(),  # Add actual timestamp parsing
-                            'text': content.strip()
-                        })
+        for text in _pdf_page_texts(path):
+            if not text:
+                continue
+                
+            # Split text into speaker blocks
+            blocks = text.split('\n\n')
+            for block in blocks:
+                # Simple speaker detection (improve as needed)
+                if ':' in block:
+                    speaker, content = block.split(':', 1)
+                    records.append({
+                        'speaker': speaker.strip(),
+                        'timestamp': datetime.now().isoformat(),  # Add actual timestamp parsing
+                        'text': content.strip()
+                    })
         return records
     except Exception as e:
         raise ParseError(f"Failed to parse PDF {path}: {e}")
 
+def _parse_html_lxml(html: bytes) -> List[Dict[str, str]]:
+    """Extract speaker blocks with precompiled XPath (libxml2)"""
+    records = []
+    tree = lxml.html.document_fromstring(html, parser=_HTML_PARSER)
+    for block in _BLOCK_XPATH(tree):
+        speaker = _NAME_XPATH(block)
+        timestamp = _TIMESTAMP_XPATH(block)
+        content = _CONTENT_XPATH(block)
+        
+        if speaker and content:
+            records.append({
+                'speaker': speaker[0].text_content().strip(),
+                'timestamp': timestamp[0].text_content().strip() if timestamp else datetime.now().isoformat(),
+                'text': content[0].text_content().strip()
+            })
+    return records
+
+def _parse_html_soup(html: str) -> List[Dict[str, str]]:
+    """Extract speaker blocks with BeautifulSoup's pure-Python parser"""
+    records = []
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Find all speaker blocks (implement actual HTML structure)
+    blocks = soup.find_all('div', class_='speaker-block')
+    for block in blocks:
+        speaker = block.find('span', class_='speaker-name')
+        timestamp = block.find('span', class_='timestamp')
+        content = block.find('div', class_='content')
+        
+        if speaker and content:
+            records.append({
+                'speaker': speaker.text.strip(),
+                'timestamp': timestamp.text.strip() if timestamp else datetime.now().isoformat(),
+                'text': content.text.strip()
+            })
+    return records
+
 def parse_html(path: Path) -> List[Dict[str, str]]:
     """
     Parse an HTML transcript.
     Returns a list of dicts: {speaker, timestamp, text}
     """
     try:
-        records = []
-        with open(path, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f, 'html.parser')
-            
-            # Find all speaker blocks (implement actual HTML structure)
-            blocks = soup.find_all('div', class_='speaker-block')
-            for block in blocks:
-                speaker = block.find('span', class_='speaker-name')
-                timestamp = block.find('span', class_='timestamp')
-                content = block.find('div', class_='content')
-                
-                if speaker and content:
-                    records.append({
-                        'speaker': speaker.text.strip(),
-                        'timestamp': timestamp.text.strip() if timestamp else datetime.now().isoformat(),
-                        'text': content.text.strip()
-                    })
-        return records
+        with open(path, 'rb') as f:
+            html = f.read()
+        
+        # lxml gets the raw bytes: it rejects str input carrying an encoding declaration
+        if LXML_AVAILABLE:
+            try:
+                return _parse_html_lxml(html)
+            except (etree.ParserError, etree.XMLSyntaxError):
+                pass
+        return _parse_html_soup(html.decode('utf-8'))
     except Exception as e:
         raise ParseError(f"Failed to parse HTML {path}: {e}")
 
@@ -259,45 +437,56 @@ def parse_vtt(path: Path) -> List[Dict[str, str]]:
     """
     Parse a VTT caption file.
     Returns a list of dicts: {speaker, timestamp, text}
+    Single pass over the file's lines; no regex, cost linear in file size.
     """
     try:
         records = []
+        current_timestamp = None
+        current_text: List[str] = []
+        
+        def flush_cue() -> None:
+            if current_timestamp and current_text:
+                records.append({
+                    'speaker': 'UNKNOWN',  # Speaker detection needed
+                    'timestamp': current_timestamp,
+                    'text': ' '.join(current_text)
+                })
+        
         with open(path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            
-            current_timestamp = None
-            current_text = []
-            
-            for line in lines:
+            for line in f:
                 line = line.strip()
                 if '-->' in line:  # Timestamp line
-                    if current_timestamp and current_text:
-                        records.append({
-                            'speaker': 'UNKNOWN',  # Speaker detection needed
-                            'timestamp': current_timestamp,
-                            'text': ' '.join(current_text)
-                        })
-                    current_timestamp = line.split('-->')[0].strip()
+                    flush_cue()
+                    current_timestamp = line.split('-->', 1)[0].strip()
                     current_text = []
                 elif line and not line.isdigit():
                     current_text.append(line)
-            
-            if current_timestamp and current_text:
-                records.append({
-                    'speaker': 'UNKNOWN',
-                    'timestamp': current_timestamp,
-                    'text': ' '.join(current_text)
-                })
+        
+        flush_cue()
         return records
     except Exception as e:
         raise ParseError(f"Failed to parse VTT {path}: {e}")
 
+# Parser for each supported file extension
+_PARSERS: Dict[str, Callable[[Path], List[Dict[str, str]]]] = {
+    '.pdf': parse_pdf,
+    '.html': parse_html,
+    '.htm': parse_html,
+    '.vtt': parse_vtt
+}
+
+def get_parser(path: Path) -> Optional[Callable[[Path], List[Dict[str, str]]]]:
+    """Return the parser for a file based on its extension, or None if unsupported"""
+    return _PARSERS.get(path.suffix.lower())
+
+# Common fillers removed by clean_text
+FILLERS = ('um', 'uh', 'ah', 'like', 'you know')
+
 def clean_text(text: str) -> str:
     """Basic text cleaning function"""
     # Remove common fillers and normalize whitespace
-    fillers = ['um', 'uh', 'ah', 'like', 'you know']
     text = text.lower()
-    for filler in fillers:
+    for filler in FILLERS:
         text = text.replace(filler, '')
     return ' '.join(text.split())
 
@@ -305,11 +494,11 @@ def normalize_speaker(speaker: str) -> str:
     """Normalize speaker names"""
     return speaker.strip().upper()
 
-def clean_and_split(records: List[Dict[str, str]]) -> List[Dict[str, str]]:
+def clean_and_split(records: List[Dict[str, str]]) -> List[Sentence]:
     """
     Clean raw records and split into sentence-level entries.
     Input: list of {speaker, timestamp, text}
-    Output: list of {speaker_norm, timestamp_epoch, timestamp_iso, sentence_id, text}
+    Output: list of Sentence(speaker_norm, timestamp_epoch, timestamp_iso, sentence_id, text)
     """
     cleaned = []
     sentence_id = 0
@@ -333,15 +522,17 @@ def clean_and_split(records: List[Dict[str, str]]) -> List[Dict[str, str]]:
             
             # Create sentence-level records
             for sentence in sentences:
-                if sentence.strip():
-                    cleaned.append({
-                        'speaker_norm': speaker,
-                        'timestamp_epoch': timestamp_epoch,
-                        'timestamp_iso': timestamp_iso,
-                        'sentence_id': f"{record['timestamp']}_{sentence_id}",
-                        'text': sentence.strip()
-                    })
-                    sentence_id += 1
+                sentence = sentence.strip()
+                if not sentence:
+                    continue
+                cleaned.append(Sentence(
+                    speaker,
+                    timestamp_epoch,
+                    timestamp_iso,
+                    f"{timestamp_iso}_{sentence_id}",
+                    sentence
+                ))
+                sentence_id += 1
         except Exception as e:
             logging.error(f"Failed to clean record: {e}")
             continue
@@ -352,7 +543,7 @@ def write_parquet(
     bank: str,
     quarter: str,
     call_id: str,
-    records: List[Dict[str, str]]
+    records: List[Sentence]
 ) -> Path:
     """
     Write cleaned records to Parquet with proper schema.
@@ -362,34 +553,24 @@ def write_parquet(
         out_dir = CLEAN_DIR / f"{bank}={quarter}"
         out_dir.mkdir(parents=True, exist_ok=True)
         
-        df = pd.DataFrame(records)
-        
-        # Define schema
-        schema = pa.schema([
-            ('speaker_norm', pa.string()),
-            ('timestamp_epoch', pa.int64()),
-            ('timestamp_iso', pa.string()),
-            ('sentence_id', pa.string()),
-            ('text', pa.string()),
-            ('bank', pa.string()),
-            ('quarter', pa.string()),
-            ('call_id', pa.string())
-        ])
-        
-        # Add metadata columns
-        df['bank'] = bank
-        df['quarter'] = quarter
-        df['call_id'] = call_id
-        
-        # Convert to Arrow table with schema
-        table = pa.Table.from_pandas(df, schema=schema)
+        # Build Arrow columns directly from the records, no pandas detour
+        n = len(records)
+        table = pa.Table.from_arrays(
+            [
+                pa.array([r.speaker_norm for r in records], pa.string()),
+                pa.array([r.timestamp_epoch for r in records], pa.int64()),
+                pa.array([r.timestamp_iso for r in records], pa.string()),
+                pa.array([r.sentence_id for r in records], pa.string()),
+                pa.array([r.text for r in records], pa.string()),
+                pa.repeat(pa.scalar(bank, pa.string()), n),
+                pa.repeat(pa.scalar(quarter, pa.string()), n),
+                pa.repeat(pa.scalar(call_id, pa.string()), n)
+            ],
+            schema=PARQUET_SCHEMA
+        )
         
         out_path = out_dir / f"{call_id}.parquet"
-        
-        # Write with schema
-        with pa.OSFile(str(out_path), 'wb') as sink:
-            with pa.RecordBatchFileWriter(sink, schema) as writer:
-                writer.write_table(table)
+        pq.write_table(table, out_path, **PARQUET_OPT)
         
         logging.info(f"Wrote {len(records)} records to {out_path}")
         return out_path
@@ -412,58 +593,113 @@ def process_call(bank: str, quarter: str) -> None:
         if not assets:
             logging.warning(f"No assets found for {bank} {quarter}")
             return
-            
-        for asset_path in assets:
-            try:
-                source_type = asset_path.suffix.lstrip(".").upper()
-                call_id = f"{bank}_{quarter}_{asset_path.stem}"
-                
-                # Parse based on file type
-                if source_type == "PDF":
-                    raw = parse_pdf(asset_path)
-                elif source_type in ("HTML", "HTM"):
-                    raw = parse_html(asset_path)
-                elif source_type == "VTT":
-                    raw = parse_vtt(asset_path)
-                else:
-                    logging.warning(f"Unsupported file type: {asset_path}")
-                    continue
-                
-                if not raw:
-                    logging.warning(f"No records parsed from {asset_path}")
-                    continue
+        
+        # Catalog rows are buffered and written in batches
+        pending: List[Tuple] = []
+        
+        def flush_pending(limit: int = 0) -> None:
+            if len(pending) > limit:
+                register_call_batch(pending)
+                pending.clear()
+        
+        try:
+            for asset_path in assets:
+                try:
+                    source_type = asset_path.suffix.lstrip(".").upper()
+                    call_id = f"{bank}_{quarter}_{asset_path.stem}"
                     
-                # Clean and split into sentences
-                cleaned = clean_and_split(raw)
-                if not cleaned:
-                    logging.warning(f"No cleaned records for {asset_path}")
-                    continue
-                
-                # Write to Parquet
-                parquet_path = write_parquet(bank, quarter, call_id, cleaned)
-                
-                # Register in database
-                register_call(call_id, bank, quarter, str(asset_path), source_type)
-                
-                logging.info(f"Successfully processed {asset_path}")
+                    # Parse based on file type
+                    parser = get_parser(asset_path)
+                    if parser is None:
+                        logging.warning(f"Unsupported file type: {asset_path}")
+                        continue
+                    raw = parser(asset_path)
+                    
+                    if not raw:
+                        logging.warning(f"No records parsed from {asset_path}")
+                        continue
+                    
+                    # Clean and split into sentences
+                    cleaned = clean_and_split(raw)
+                    if not cleaned:
+                        logging.warning(f"No cleaned records for {asset_path}")
+                        continue
+                    
+                    # Write to Parquet
+                    parquet_path = write_parquet(bank, quarter, call_id, cleaned)
+                    
+                    # Register in database
+                    pending.append(
+                        _call_row(call_id, bank, quarter, str(asset_path), source_type)
+                    )
+                    
+                    logging.info(f"Successfully processed {asset_path}")
+                    
+                except Exception as e:
+                    logging.error(f"Error processing {asset_path}: {e}")
+                    pending.append(_call_row(
+                        call_id,
+                        bank,
+                        quarter,
+                        str(asset_path),
+                        source_type,
+                        "error",
+                        str(e)
+                    ))
                 
-            except Exception as e:
-                logging.error(f"Error processing {asset_path}: {e}")
-                register_call(
-                    call_id,
-                    bank,
-                    quarter,
-                    str(asset_path),
-                    source_type,
-                    "error",
-                    str(e)
-                )
-                continue
+                flush_pending(REGISTER_BATCH_SIZE - 1)
+        
+        finally:
+            # Rows buffered before an unexpected error are still recorded
+            flush_pending()
                 
     except Exception as e:
         logging.error(f"Error processing {bank} {quarter}: {e}")
         raise
 
+def _process_call_worker(bank: str, quarter: str) -> Optional[str]:
+    """Run process_call in a worker, returning the error message on failure"""
+    try:
+        process_call(bank, quarter)
+    except Exception as e:
+        return str(e)
+    return None
+
+def process_calls_batch(
+    call_specs: List[Tuple[str, str]],
+    workers: int = DEFAULT_WORKERS,
+    max_concurrent_results: Optional[int] = None
+) -> Dict[Tuple[str, str], Optional[str]]:
+    """
+    Run process_call for many bank + quarter pairs across worker processes.
+    Each worker opens its own SQLite connections, since handles are not fork-safe.
+    At most max_concurrent_results calls are in flight at once (default: 2 per
+    worker) to bound memory when parsing very large documents.
+    Returns a dict mapping (bank, quarter) to None on success or the error message.
+    """
+    if max_concurrent_results is None:
+        max_concurrent_results = workers * 2
+    
+    slots = threading.BoundedSemaphore(max_concurrent_results)
+    results: Dict[Tuple[str, str], Optional[str]] = {}
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for spec in call_specs:
+            slots.acquire()
+            future = executor.submit(_process_call_worker, *spec)
+            future.add_done_callback(lambda _: slots.release())
+            futures[future] = spec
+        
+        for future in as_completed(futures):
+            bank, quarter = futures[future]
+            error = future.result()
+            if error:
+                logging.error(f"Failed to process {bank} {quarter}: {error}")
+            results[(bank, quarter)] = error
+    
+    return results
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description="ETL for bank earnings calls")
@@ -486,6 +722,12 @@ def main():
         action="store_true",
         help="Dry run - don't write any files"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1, sequential)"
+    )
     
     args = parser.parse_args()
     
@@ -493,6 +735,12 @@ def main():
         # Initialize database
         initialize_database()
         
+        # Process bank + quarter pairs in parallel when requested
+        if args.workers > 1 and not args.dry_run:
+            call_specs = [(bank, quarter) for bank in args.banks for quarter in args.quarters]
+            process_calls_batch(call_specs, workers=args.workers)
+            return
+        
         # Process each bank and quarter
         for bank in args.banks:
             for quarter in args.quarters:
@@ -508,6 +756,8 @@ def main():
     except Exception as e:
         logging.error(f"ETL pipeline failed: {e}")
         raise
+    finally:
+        close_connection()
 
 if __name__ == "__main__":
     main()
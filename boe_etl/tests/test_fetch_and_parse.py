@@ -4,21 +4,60 @@ from pathlib import Path
 import tempfile
 import sqlite3
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
 
+import pyarrow.parquet as pq
+
+import fetch_and_parse
 from fetch_and_parse import (
     validate_bank_name,
     validate_quarter,
     register_call,
+    register_call_batch,
+    close_connection,
+    fetch_asset,
     fetch_assets,
     parse_pdf,
     parse_html,
     parse_vtt,
+    get_parser,
     clean_and_split,
     write_parquet,
-    process_call
+    Sentence,
+    PARQUET_SCHEMA,
+    process_call,
+    process_calls_batch,
+    _process_call_worker,
+    ETLException
 )
 
+def _write_pdf(path, lines):
+    """Write a minimal one-page PDF with one Helvetica text line per entry"""
+    stream = "BT /F1 12 Tf 14 TL 72 720 Td " + " ".join(
+        "(%s) Tj T*" % line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        for line in lines
+    ) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        "/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        "<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+    ]
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += ("%d 0 obj\n%s\nendobj\n" % (number, body)).encode("latin-1")
+    xref = len(out)
+    out += ("xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)).encode("latin-1")
+    out += "".join("%010d 00000 n \n" % offset for offset in offsets).encode("latin-1")
+    out += ("trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(objects) + 1, xref)).encode("latin-1")
+    Path(path).write_bytes(out)
+
 class TestETLFunctions(unittest.TestCase):
     def setUp(self):
         # Create temporary directory for tests
@@ -41,8 +80,15 @@ class TestETLFunctions(unittest.TestCase):
         ''')
         conn.commit()
         conn.close()
+        
+        # Point the catalog at the test database
+        db_patcher = patch('fetch_and_parse.DB_PATH', self.test_db)
+        db_patcher.start()
+        self.addCleanup(db_patcher.stop)
+        close_connection()
 
     def tearDown(self):
+        close_connection()
         self.temp_dir.cleanup()
 
     def test_validate_bank_name(self):
@@ -70,7 +116,8 @@ class TestETLFunctions(unittest.TestCase):
         """Test asset fetching"""
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.content = b"test content"
+        mock_response.iter_content.return_value = [b"test ", b"content"]
+        mock_response.__enter__.return_value = mock_response
         mock_get.return_value = mock_response
         
         test_url = "https://example.com/test.pdf"
@@ -78,18 +125,36 @@ class TestETLFunctions(unittest.TestCase):
         
         fetch_asset(test_url, test_path)
         self.assertTrue(test_path.exists())
+        self.assertEqual(test_path.read_bytes(), b"test content")
+        mock_get.assert_called_once_with(test_url, stream=True, timeout=60)
 
     def test_parse_pdf(self):
         """Test PDF parsing"""
-        # Create test PDF with sample content
+        # Create a real single-page PDF with sample content
         test_pdf = Path(self.temp_dir.name) / "test.pdf"
-        with open(test_pdf, 'wb') as f:
-            f.write(b"CEO: This is a test PDF\n\nAnalyst: Another test")
+        _write_pdf(test_pdf, [
+            "CEO: This is a test PDF",
+            "We expect more next year.",
+            "Analyst: Another test",
+        ])
         
         records = parse_pdf(test_pdf)
         self.assertGreater(len(records), 0)
         self.assertIn("speaker", records[0])
         self.assertIn("text", records[0])
+        self.assertEqual(records[0]["speaker"], "CEO")
+        # Lines without a speaker prefix stay with the surrounding block
+        self.assertIn("We expect more next year.", records[0]["text"])
+
+    def test_parse_pdf_pdfplumber(self):
+        """Test PDF parsing without PyMuPDF"""
+        test_pdf = Path(self.temp_dir.name) / "test.pdf"
+        _write_pdf(test_pdf, ["CEO: This is a test PDF", "We expect more next year."])
+        
+        with patch('fetch_and_parse.fitz', None):
+            records = parse_pdf(test_pdf)
+        self.assertEqual(records[0]["speaker"], "CEO")
+        self.assertIn("We expect more next year.", records[0]["text"])
 
     def test_parse_html(self):
         """Test HTML parsing"""
@@ -109,6 +174,24 @@ class TestETLFunctions(unittest.TestCase):
         self.assertIn("speaker", records[0])
         self.assertIn("text", records[0])
 
+    def test_parse_html_encoding_declaration(self):
+        """Test parsing XHTML that declares its encoding"""
+        test_html = Path(self.temp_dir.name) / "test.xhtml"
+        with open(test_html, 'w', encoding='utf-8') as f:
+            f.write("""<?xml version="1.0" encoding="utf-8"?>
+                <html><body>
+                <div class="speaker-block">
+                    <span class="speaker-name">CFO</span>
+                    <div class="content">Revenue rose 5% — ahead of plan</div>
+                </div>
+                </body></html>
+            """)
+        
+        records = parse_html(test_html)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["speaker"], "CFO")
+        self.assertEqual(records[0]["text"], "Revenue rose 5% — ahead of plan")
+
     def test_parse_vtt(self):
         """Test VTT parsing"""
         # Create test VTT with sample content
@@ -124,6 +207,14 @@ class TestETLFunctions(unittest.TestCase):
         self.assertIn("speaker", records[0])
         self.assertIn("text", records[0])
 
+    def test_get_parser(self):
+        """Test parser dispatch by file extension"""
+        self.assertIs(get_parser(Path("deck.pdf")), parse_pdf)
+        self.assertIs(get_parser(Path("DECK.PDF")), parse_pdf)
+        self.assertIs(get_parser(Path("call.htm")), parse_html)
+        self.assertIs(get_parser(Path("call.vtt")), parse_vtt)
+        self.assertIsNone(get_parser(Path("deck.pptx")))
+
     def test_clean_and_split(self):
         """Test text cleaning and splitting"""
         test_records = [{
@@ -134,8 +225,42 @@ class TestETLFunctions(unittest.TestCase):
         
         cleaned = clean_and_split(test_records)
         self.assertGreater(len(cleaned), 0)
-        self.assertIn('sentence_id', cleaned[0])
-        self.assertIn('text', cleaned[0])
+        self.assertTrue(cleaned[0].sentence_id)
+        self.assertTrue(cleaned[0].text)
+
+    def test_write_parquet(self):
+        """Test sentence records round-trip through Parquet"""
+        records = [
+            Sentence("ceo", 1684836000, "2023-05-23T10:00:00", "s1", "Revenue grew."),
+            Sentence("cfo", 1684836060, "2023-05-23T10:01:00", "s2", "Margins held."),
+        ]
+        with patch('fetch_and_parse.CLEAN_DIR', Path(self.temp_dir.name)):
+            out_path = write_parquet("test_bank", "Q1_2023", "test_call", records)
+        
+        self.assertEqual(out_path, Path(self.temp_dir.name) / "test_bank=Q1_2023" / "test_call.parquet")
+        table = pq.read_table(out_path)
+        self.assertTrue(table.schema.equals(PARQUET_SCHEMA))
+        self.assertEqual(table.to_pylist(), [
+            {"speaker_norm": "ceo", "timestamp_epoch": 1684836000,
+             "timestamp_iso": "2023-05-23T10:00:00", "sentence_id": "s1",
+             "text": "Revenue grew.", "bank": "test_bank", "quarter": "Q1_2023",
+             "call_id": "test_call"},
+            {"speaker_norm": "cfo", "timestamp_epoch": 1684836060,
+             "timestamp_iso": "2023-05-23T10:01:00", "sentence_id": "s2",
+             "text": "Margins held.", "bank": "test_bank", "quarter": "Q1_2023",
+             "call_id": "test_call"},
+        ])
+        metadata = pq.ParquetFile(out_path).metadata
+        self.assertEqual(metadata.row_group(0).column(0).compression, "ZSTD")
+
+    def test_write_parquet_empty(self):
+        """Test an empty record list writes an empty file with the full schema"""
+        with patch('fetch_and_parse.CLEAN_DIR', Path(self.temp_dir.name)):
+            out_path = write_parquet("test_bank", "Q1_2023", "empty_call", [])
+        
+        table = pq.read_table(out_path)
+        self.assertEqual(table.num_rows, 0)
+        self.assertTrue(table.schema.equals(PARQUET_SCHEMA))
 
     def test_register_call(self):
         """Test call registration in database"""
@@ -161,5 +286,82 @@ class TestETLFunctions(unittest.TestCase):
         self.assertIsNotNone(result)
         conn.close()
 
+    def test_register_call_batch(self):
+        """Test batched call registration in database"""
+        rows = [
+            (f"call_{i}", "test_bank", "Q1_2023", "test_url", "PDF",
+             datetime.now(), "success", None)
+            for i in range(3)
+        ]
+        
+        register_call_batch(rows)
+        
+        conn = sqlite3.connect(self.test_db)
+        count = conn.execute("SELECT COUNT(*) FROM calls").fetchone()[0]
+        conn.close()
+        self.assertEqual(count, 3)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "requires fork")
+    def test_connection_not_reused_after_fork(self):
+        """Test a forked child opens its own connection and never closes the parent's"""
+        with fetch_and_parse._CONN_LOCK:
+            parent_conn = fetch_and_parse._get_connection()
+        
+        pid = os.fork()
+        if pid == 0:
+            # Child: report through the exit code only
+            try:
+                ok = (fetch_and_parse._CONN is None
+                      and parent_conn in fetch_and_parse._INHERITED_CONNS)
+                with fetch_and_parse._CONN_LOCK:
+                    ok = ok and fetch_and_parse._get_connection() is not parent_conn
+            finally:
+                os._exit(0 if ok else 1)
+        
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.WEXITSTATUS(status), 0)
+        # The parent's handle is still usable
+        parent_conn.execute("SELECT 1")
+
+    @patch('fetch_and_parse.write_parquet')
+    @patch('fetch_and_parse.clean_and_split', return_value=[{"text": "ok"}])
+    @patch('fetch_and_parse.get_parser')
+    @patch('fetch_and_parse.fetch_assets')
+    def test_process_call_flushes_on_error(self, mock_fetch, mock_get_parser, *_):
+        """Test buffered catalog rows are written when processing is interrupted"""
+        mock_fetch.return_value = [Path("first.txt"), Path("second.txt")]
+        parser = MagicMock(side_effect=[[{"text": "ok"}], KeyboardInterrupt()])
+        mock_get_parser.return_value = parser
+        
+        with self.assertRaises(KeyboardInterrupt):
+            process_call("test_bank", "Q1_2023")
+        
+        conn = sqlite3.connect(self.test_db)
+        rows = conn.execute("SELECT call_id, status FROM calls").fetchall()
+        conn.close()
+        self.assertEqual(rows, [("test_bank_Q1_2023_first", "success")])
+
+    @patch('fetch_and_parse.ProcessPoolExecutor', ThreadPoolExecutor)
+    @patch('fetch_and_parse.process_call')
+    def test_process_calls_batch(self, mock_process_call):
+        """Test batch processing matches sequential processing"""
+        def fake_process_call(bank, quarter):
+            if bank == "bad_bank":
+                raise ETLException("boom")
+        mock_process_call.side_effect = fake_process_call
+        
+        call_specs = [
+            ("bank1", "Q1_2023"),
+            ("bad_bank", "Q2_2023"),
+            ("bank2", "Q3_2023")
+        ]
+        
+        sequential = {spec: _process_call_worker(*spec) for spec in call_specs}
+        parallel = process_calls_batch(call_specs, workers=2, max_concurrent_results=1)
+        
+        self.assertEqual(parallel, sequential)
+        self.assertIsNone(parallel[("bank1", "Q1_2023")])
+        self.assertEqual(parallel[("bad_bank", "Q2_2023")], "boom")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,209 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+# The frontend imports streamlit at module level; the helpers under test do not use it
+sys.modules.setdefault('streamlit', MagicMock())
+
+import pure_etl_frontend
+from pure_etl_frontend import (
+    PureETL,
+    FINANCIAL_VOCABULARY,
+    TEMPORAL_TERMS,
+    _terms_finder,
+    _terms_pattern,
+)
+
+class TestVocabularyFinders(unittest.TestCase):
+    @unittest.skipUnless(pure_etl_frontend.AHOCORASICK_AVAILABLE, "pyahocorasick not installed")
+    def test_finders_agree(self):
+        """Test the Aho-Corasick and regex finders return the same terms"""
+        texts = [
+            "we expect growth next year-over-year",
+            "next year-over-year revenue",
+            "interest income and noninterest expense",
+            "deposits, fees and eps in the next quarter",
+            "the steps we took were compared to last quarter",
+            "",
+        ]
+        for terms in (FINANCIAL_VOCABULARY, TEMPORAL_TERMS):
+            automaton_find = _terms_finder(terms)
+            regex_find = _terms_pattern(terms).findall
+            for text in texts:
+                with self.subTest(text=text):
+                    self.assertEqual(automaton_find(text), regex_find(text))
+
+    def test_terms_do_not_overlap(self):
+        """Test overlapping terms resolve leftmost-longest, without repeats"""
+        find = _terms_finder(TEMPORAL_TERMS)
+        self.assertEqual(find("next year-over-year"), ["next year"])
+        self.assertEqual(find("year-over-year"), ["year-over-year"])
+
+class TestPureETL(unittest.TestCase):
+    def setUp(self):
+        # PureETL creates its upload, output and cache directories under the cwd
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.temp_dir.name)
+        self.etl = PureETL()
+
+    def _features(self, texts):
+        df = pd.DataFrame({'text': texts, 'speaker_raw': 'UNKNOWN'})
+        return self.etl.extract_raw_features(df)
+
+    def test_financial_figures(self):
+        """Test each figure is reported once, with its unit"""
+        df = self._features([
+            "Revenue was approximately 1,200 million, up 5% and $3.4 billion",
+            "No figures in this sentence",
+        ])
+        self.assertEqual(df['financial_figures'].tolist(),
+                         ["approximately 1,200 million|5%|$3.4 billion", "NONE"])
+        self.assertEqual(df['has_financial_figures'].tolist(), [True, False])
+
+    def test_word_count_external_frames(self):
+        """Test word counts match str.split() and non-string cells are coerced"""
+        df = self._features(["Revenue  grew\tstrongly \n this year ", "   ", 1200, None])
+        self.assertEqual(df['word_count'].tolist(), [5, 0, 1, 0])
+        self.assertEqual(df['text'].tolist()[2:], ["1200", ""])
+        self.assertEqual(df['is_empty_text'].tolist(), [False, False, False, True])
+
+    def test_terms_match_word_prefixes(self):
+        """Test terms match at the start of a word only"""
+        df = self._features([
+            "The steps on noninterest expense and deposits",
+            "We expect interest income growth next year",
+        ])
+        self.assertEqual(df['all_financial_terms'].tolist(),
+                         ["deposit|expense", "income|growth|interest"])
+        self.assertEqual(df['temporal_indicators'].tolist(), ["NONE", "expect|next year"])
+
+    def test_speakers(self):
+        """Test scalar and vectorized speaker extraction agree"""
+        texts = pd.Series([
+            "JOHN SMITH: Thank you",
+            "Jane Doe: Good morning",
+            "CFO: Margins improved",
+            "Chief Risk Officer: Losses were low",
+            "lower case: not a speaker",
+            "No colon in this sentence",
+            "A long sentence whose first colon falls well beyond the speaker window: indeed",
+        ])
+        expected = ["JOHN SMITH", "Jane Doe", "CFO", "Chief Risk Officer",
+                    "UNKNOWN", "UNKNOWN", "UNKNOWN"]
+        self.assertEqual([self.etl.extract_speaker_raw(t) for t in texts], expected)
+        self.assertEqual(self.etl.extract_speakers_raw(texts).tolist(), expected)
+
+    def test_ensure_complete(self):
+        """Test the opt-in gap check fills columns from externally built frames"""
+        df = pd.DataFrame({
+            'text': ["Revenue grew strongly this year", None],
+            'speaker_raw': pd.Series(["CEO", None], dtype='category'),
+            'institution': ["Bank", None],
+            'sentence_id': [1, None],
+        })
+        df = self.etl.extract_raw_features(df, ensure_complete=True)
+        self.assertFalse(df.isna().any().any())
+        self.assertEqual(df['institution'].tolist(), ["Bank", "UNKNOWN"])
+        self.assertEqual(df['speaker_raw'].tolist(), ["CEO", "UNKNOWN"])
+        self.assertIsInstance(df['speaker_raw'].dtype, pd.CategoricalDtype)
+        self.assertTrue(pd.api.types.is_integer_dtype(df['sentence_id']))
+        self.assertEqual(df['is_empty_text'].tolist(), [False, True])
+
+    def _process(self, contents, **kwargs):
+        uploads = []
+        for name, data in contents.items():
+            upload = MagicMock()
+            upload.name = name
+            upload.getbuffer.return_value = memoryview(data)
+            uploads.append(upload)
+        return self.etl.process_files("Bank", "Q1_2025", uploads, **kwargs)
+
+    def test_small_uploads_stay_in_process(self):
+        """Test small batches are extracted without starting worker processes"""
+        contents = {"a.txt": b"CEO: Revenue grew strongly this year.",
+                    "b.txt": b"CFO: Margins were stable overall."}
+        with patch.object(pure_etl_frontend, 'ProcessPoolExecutor') as pool:
+            output_files, records, status = self._process(contents)
+        self.assertEqual(status, "Success")
+        self.assertEqual(records, 2)
+        pool.assert_not_called()
+
+    def test_file_path_only_set_for_archived_uploads(self):
+        """Test file_path points at the archived copy, or is null without one"""
+        contents = {"a.txt": b"CEO: Revenue grew strongly this year."}
+        
+        output_files, _, _ = self._process(contents)
+        df = pd.read_parquet(output_files[0])
+        self.assertTrue(df['file_path'].isna().all())
+        self.assertEqual(df['source_file'].tolist(), ["a.txt"])
+        
+        output_files, _, _ = self._process(contents, archive_uploads=True)
+        df = pd.read_parquet(output_files[0])
+        archived = Path(df['file_path'].iat[0])
+        self.assertEqual(archived.name, "a.txt")
+        self.assertEqual(archived.read_bytes(), contents["a.txt"])
+
+    def test_large_uploads_use_process_pool(self):
+        """Test batches over the threshold are extracted in spawned workers"""
+        # Spawned workers import the frontend by name, streamlit included
+        module_dir = str(Path(pure_etl_frontend.__file__).resolve().parent)
+        stub_dir = Path(self.temp_dir.name) / "stubs"
+        stub_dir.mkdir()
+        (stub_dir / "streamlit.py").write_text("")
+        with patch.object(sys, 'path', [module_dir, str(stub_dir)] + sys.path):
+            contents = {"a.txt": b"CEO: Revenue grew strongly this year.",
+                        "b.txt": b"CFO: Margins were stable overall."}
+            real_pool = pure_etl_frontend.ProcessPoolExecutor
+            with patch.object(pure_etl_frontend, 'PROCESS_POOL_MIN_BYTES', 0), \
+                 patch.object(pure_etl_frontend, 'ProcessPoolExecutor',
+                              side_effect=real_pool) as pool:
+                output_files, records, status = self._process(contents)
+        self.assertEqual(status, "Success")
+        self.assertEqual(records, 2)
+        pool.assert_called_once()
+        df = pd.read_parquet(output_files[0])
+        self.assertEqual(df['speaker_raw'].tolist(), ["CEO", "CFO"])
+
+    def test_extraction_cache_round_trip(self):
+        """Test cached sentences and document type are read back unchanged"""
+        key = self.etl._cache_key("call.txt", b"CEO: Revenue grew")
+        self.assertNotEqual(key, self.etl._cache_key("deck.txt", b"CEO: Revenue grew"))
+        self.assertIsNone(self.etl._load_cached(key))
+        
+        sentences = ["CEO: Revenue grew strongly", "Margins were stable overall"]
+        self.etl._store_cached(key, sentences, 'earnings_call')
+        self.assertEqual(self.etl._load_cached(key), (sentences, 'earnings_call'))
+
+    def test_cache_key_tracks_pdf_engine(self):
+        """Test PDF cache entries are keyed on the PDF library in use"""
+        pdf_key = self.etl._cache_key("call.pdf", b"%PDF")
+        text_key = self.etl._cache_key("call.txt", b"text")
+        with patch.object(pure_etl_frontend, 'PDF_LIBRARY', 'other-engine'):
+            self.assertNotEqual(self.etl._cache_key("call.pdf", b"%PDF"), pdf_key)
+            self.assertEqual(self.etl._cache_key("call.txt", b"text"), text_key)
+
+    def test_prune_cache(self):
+        """Test the least recently used entries are evicted first"""
+        keys = [self.etl._cache_key(f"doc{i}.txt", b"x") for i in range(3)]
+        for i, key in enumerate(keys):
+            self.etl._store_cached(key, [f"Sentence number {i} here"], 'text_document')
+            os.utime(self.etl.cache_dir / f"{key}.parquet", (1000 + i, 1000 + i))
+        
+        # Reading an entry makes it the most recently used
+        self.etl._load_cached(keys[0])
+        size = (self.etl.cache_dir / f"{keys[0]}.parquet").stat().st_size
+        self.etl._prune_cache(max_bytes=size * 2)
+        
+        self.assertIsNotNone(self.etl._load_cached(keys[0]))
+        self.assertIsNone(self.etl._load_cached(keys[1]))
+        self.assertIsNotNone(self.etl._load_cached(keys[2]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import tempfile
+import pickle
+from pathlib import Path
+from unittest.mock import patch
+
+from boe_etl.utils import quarter_utils
+from boe_etl.utils.quarter_utils import (
+    normalize_quarter,
+    normalize_quarters,
+    iter_source_files,
+    process_file_path,
+    _reset_dir_cache
+)
+
+class TestQuarterUtils(unittest.TestCase):
+    def test_normalize_quarter(self):
+        """Test quarter extraction from filenames"""
+        self.assertEqual(normalize_quarter("jpmorgan_q1_2025.pdf"), "Q1_2025")
+        self.assertEqual(normalize_quarter("2025fsqtr1rslt.pdf"), "Q1_2025")
+        self.assertEqual(normalize_quarter("4Q24-earnings-press-release.pdf"), "Q4_2024")
+        self.assertIsNone(normalize_quarter("annual_report.pdf"))
+
+    def test_normalize_quarter_ignores_case(self):
+        """Test quarter extraction is case-insensitive"""
+        self.assertEqual(
+            normalize_quarter("JPMorgan_Q1_2025.pdf"),
+            normalize_quarter("jpmorgan_q1_2025.pdf")
+        )
+
+    def test_normalize_quarter_precedence(self):
+        """Test names mentioning several quarters resolve in config order"""
+        self.assertEqual(normalize_quarter("jpm_4q24_vs_q1_2025.pdf"), "Q1_2025")
+        self.assertEqual(normalize_quarter("jpm_q1_2025_vs_4q24.pdf"), "Q1_2025")
+
+    def test_pattern_snapshot_revalidated(self):
+        """Test a snapshot is ignored once the config's size or mtime changes"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            snapshot_dir = Path(temp_dir)
+            with patch.object(quarter_utils, '_SNAPSHOT_DIR', snapshot_dir):
+                sources = quarter_utils._read_pattern_sources(quarter_utils._DEFAULT_CONFIG)
+                snapshot = snapshot_dir / 'quarter_patterns.pkl'
+                self.assertTrue(snapshot.exists())
+                
+                # A stale snapshot (e.g. the YAML replaced by an older copy) is not used
+                with open(snapshot, 'wb') as f:
+                    pickle.dump(((0, 0), {'Q9_1999': ['q9']}), f)
+                self.assertEqual(
+                    quarter_utils._read_pattern_sources(quarter_utils._DEFAULT_CONFIG),
+                    sources
+                )
+        
+        # Caller-supplied configs are never snapshotted
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = Path(temp_dir) / 'custom.yml'
+            config.write_text("quarter_patterns:\n  - name: Q2_2025\n    patterns: ['q2']\n")
+            with patch.object(quarter_utils, '_SNAPSHOT_DIR', Path(temp_dir) / 'cache'):
+                self.assertEqual(quarter_utils._read_pattern_sources(config), {'Q2_2025': ['q2']})
+            self.assertEqual([p.name for p in Path(temp_dir).iterdir()], ['custom.yml'])
+
+    def test_normalize_quarters(self):
+        """Test batch quarter extraction preserves input order"""
+        self.assertEqual(
+            normalize_quarters(["Q4-2024_call.pdf", "notes.txt", "2025_Q1.pdf"]),
+            ["Q4_2024", None, "Q1_2025"]
+        )
+
+    def test_process_file_path(self):
+        """Test target paths are partitioned by quarter"""
+        _reset_dir_cache()
+        with tempfile.TemporaryDirectory() as tmp:
+            base_dir = Path(tmp)
+            target = process_file_path(Path("in/jpm_q1_2025.pdf"), base_dir)
+            self.assertEqual(target, base_dir / "quarter=Q1_2025" / "jpm_q1_2025.pdf")
+            self.assertTrue(target.parent.is_dir())
+            
+            again = process_file_path("in/citi_q1_2025.pdf", base_dir)
+            self.assertEqual(again.parent, target.parent)
+            
+            self.assertIsNone(process_file_path(Path("in/notes.txt"), base_dir))
+        _reset_dir_cache()
+
+    def test_iter_source_files(self):
+        """Test recursive file discovery"""
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "jpm" / "q1").mkdir(parents=True)
+            (root / "top_q4_2024.pdf").write_bytes(b"x")
+            (root / "jpm" / "q1" / "jpm_q1_2025.pdf").write_bytes(b"xyz")
+            
+            found = {Path(path).name: stat.st_size for path, stat in iter_source_files(tmp)}
+            self.assertEqual(found, {"top_q4_2024.pdf": 1, "jpm_q1_2025.pdf": 3})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@ from pathlib import Path
 
 def get_project_root() -> Path:
     """Get the project root directory"""
-    return Path(__file__).parent.parent
+    return Path(__file__).parent.parent.parent
 
 def get_data_dir() -> Path:
     """Get the data directory"""
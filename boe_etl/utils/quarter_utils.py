@@ -1,11 +1,16 @@
 """
 Utilities for extracting and normalizing quarter information from filenames.
 """
+import os
 import re
 import yaml
+import pickle
 import logging
+import functools
+import tempfile
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Pattern
+from typing import Dict, Iterator, List, Optional, Pattern, Set, Tuple, Union
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -13,6 +18,68 @@ logger = logging.getLogger(__name__)
 # Load quarter patterns from YAML config
 QUARTER_PATTERNS: Dict[str, List[Pattern]] = {}
 
+_DEFAULT_CONFIG = Path(__file__).parent.parent / 'config' / 'quarter_patterns.yml'
+
+# Parsed-config snapshots live in the user cache directory, never beside the YAML
+_SNAPSHOT_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'boe_etl'
+
+# Guards (re)loading so concurrent workers compile the patterns only once
+_LOAD_LOCK = threading.RLock()
+
+# Output directories already created by process_file_path in this process
+_CREATED_DIRS: Set[Path] = set()
+
+def _parse_pattern_yaml(config_path: Path) -> Dict[str, List[str]]:
+    """Read quarter name -> pattern strings from a YAML config."""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        cfg = yaml.safe_load(f)
+    
+    return {
+        item['name']: list(item['patterns'])
+        for item in cfg.get('quarter_patterns', [])
+    }
+
+def _read_pattern_sources(config_path: Path) -> Dict[str, List[str]]:
+    """
+    Read quarter name -> pattern strings, reusing a snapshot for the default config.
+    
+    The parsed default config is pickled into the user cache directory together
+    with the YAML's size and mtime in nanoseconds, and reused only while both
+    still match. Caller-supplied configs are always parsed from the YAML.
+    """
+    if config_path != _DEFAULT_CONFIG:
+        return _parse_pattern_yaml(config_path)
+    
+    stat = config_path.stat()
+    key = (stat.st_size, stat.st_mtime_ns)
+    snapshot = _SNAPSHOT_DIR / 'quarter_patterns.pkl'
+    try:
+        with open(snapshot, 'rb') as f:
+            cached_key, sources = pickle.load(f)
+        if cached_key == key:
+            return sources
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        pass
+    
+    sources = _parse_pattern_yaml(config_path)
+    
+    # Write atomically so concurrent loaders never see a partial snapshot;
+    # the cache directory may be unwritable, in which case we just skip it
+    try:
+        _SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=_SNAPSHOT_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((key, sources), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, snapshot)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.debug(f"Could not write quarter pattern snapshot {snapshot}: {e}")
+    
+    return sources
+
 def load_quarter_patterns(config_path: Optional[Path] = None) -> None:
     """
     Load quarter patterns from YAML configuration file.
@@ -20,68 +87,139 @@ def load_quarter_patterns(config_path: Optional[Path] = None) -> None:
     Args:
         config_path: Path to the YAML configuration file. If None, uses default location.
     """
-    global QUARTER_PATTERNS
-    
-    if config_path is None:
-        config_path = Path(__file__).parent.parent / 'config' / 'quarter_patterns.yml'
+    config_path = Path(config_path) if config_path is not None else _DEFAULT_CONFIG
     
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            cfg = yaml.safe_load(f)
+    with _LOAD_LOCK:
+        try:
+            sources = _read_pattern_sources(config_path)
             
-        QUARTER_PATTERNS.clear()
-        for item in cfg.get('quarter_patterns', []):
-            QUARTER_PATTERNS[item['name']] = [
-                re.compile(pattern) for pattern in item['patterns']
-            ]
+            QUARTER_PATTERNS.clear()
+            for quarter, patterns in sources.items():
+                QUARTER_PATTERNS[quarter] = [
+                    re.compile(pattern, re.IGNORECASE) for pattern in patterns
+                ]
             
-    except Exception as e:
-        logger.error(f"Failed to load quarter patterns: {e}")
-        raise
+            _normalize_quarter_cached.cache_clear()
+                
+        except Exception as e:
+            logger.error(f"Failed to load quarter patterns: {e}")
+            raise
+
+def _ensure_quarter_patterns() -> None:
+    """
+    Load the default quarter patterns once, even when called from several threads.
+    
+    Raises:
+        RuntimeError: If the configuration defines no usable quarter patterns
+    """
+    if QUARTER_PATTERNS:
+        return
+    
+    with _LOAD_LOCK:
+        if not QUARTER_PATTERNS:
+            load_quarter_patterns()
+    
+    if not QUARTER_PATTERNS:
+        raise RuntimeError(f"No quarter patterns defined in {_DEFAULT_CONFIG}")
+
+@functools.lru_cache(maxsize=65536)
+def _normalize_quarter_cached(filename: str) -> Optional[str]:
+    """Look up the quarter for a filename (memoized)."""
+    # Separate searches keep each pattern's literal-prefix scan, which beats
+    # any single fused alternation over these patterns
+    for quarter, patterns in QUARTER_PATTERNS.items():
+        for pattern in patterns:
+            if pattern.search(filename):
+                return quarter
+    
+    return None
 
 def normalize_quarter(filename: str) -> Optional[str]:
     """
     Extract and normalize quarter information from a filename.
     
+    Patterns are matched case-insensitively in config order, so when a
+    filename mentions more than one quarter, the first configured quarter
+    wins. Results are memoized per filename and reset whenever the patterns are
+    reloaded.
+    
     Args:
         filename: The input filename to extract quarter from
         
     Returns:
         str: The normalized quarter string (e.g., 'Q1_2025') or None if no match found
     """
-    if not QUARTER_PATTERNS:
-        load_quarter_patterns()
+    return _normalize_quarter_cached(str(filename))
+
+normalize_quarter.cache_clear = _normalize_quarter_cached.cache_clear
+
+def normalize_quarters(filenames: List[str]) -> List[Optional[str]]:
+    """
+    Normalize a batch of filenames.
     
-    filename = str(filename).lower()
+    Args:
+        filenames: The input filenames to extract quarters from
+        
+    Returns:
+        list: The normalized quarter (or None) for each filename, in input order
+    """
+    cached = _normalize_quarter_cached
+    return [cached(str(filename)) for filename in filenames]
+
+def iter_source_files(root: Union[str, Path]) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Recursively walk a directory tree and yield every regular file in it.
     
-    for quarter, patterns in QUARTER_PATTERNS.items():
-        for pattern in patterns:
-            if pattern.search(filename):
-                return quarter
+    Uses ``os.scandir`` with an explicit stack, so file-type checks come from
+    the directory listing itself and no ``Path`` objects are allocated.
     
-    return None
+    Args:
+        root: The directory to walk
+        
+    Yields:
+        tuple: The file path as a string and its ``os.stat_result``
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.path, entry.stat()
+        except OSError as e:
+            logger.warning(f"Could not scan directory {current}: {e}")
 
-def process_file_path(file_path: Path, base_dir: Path) -> Optional[Path]:
+def process_file_path(file_path: Union[str, Path], base_dir: Path) -> Optional[Path]:
     """
     Process a file path and return the target path with quarter information.
     
     Args:
-        file_path: The source file path
+        file_path: The source file path, as a string or Path
         base_dir: The base directory for output files
         
     Returns:
         Path: The target file path with quarter information, or None if quarter cannot be determined
     """
-    quarter = normalize_quarter(file_path.name)
+    name = os.path.basename(file_path)
+    quarter = normalize_quarter(name)
     if not quarter:
-        logger.warning(f"Could not determine quarter for file: {file_path.name}")
+        logger.warning(f"Could not determine quarter for file: {name}")
         return None
     
     # Create target directory structure: base_dir/quarter=Q1_2025/filename
     target_dir = base_dir / f"quarter={quarter}"
-    target_dir.mkdir(parents=True, exist_ok=True)
+    if target_dir not in _CREATED_DIRS:
+        target_dir.mkdir(parents=True, exist_ok=True)
+        _CREATED_DIRS.add(target_dir)
     
-    return target_dir / file_path.name
+    return target_dir / name
+
+def _reset_dir_cache() -> None:
+    """Forget which output directories have been created (used by tests)."""
+    _CREATED_DIRS.clear()
 
-# Load patterns when module is imported
-load_quarter_patterns()
+# Compile patterns when module is imported so lookups never pay for it
+_ensure_quarter_patterns()
@@ -9,13 +9,14 @@ This script installs the BoE ETL package and its dependencies.
 import subprocess
 import sys
 import os
+import tempfile
 from pathlib import Path
 
 def run_command(cmd, description):
-    """Run a command and handle errors."""
+    """Run a command (given as an argument list) and handle errors."""
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(cmd, shell=True, check=True, capture_output=True, text=True)
+        result = subprocess.run(cmd, shell=False, check=True, capture_output=True, text=True)
         print(f"✅ {description} completed successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -23,6 +24,21 @@ def run_command(cmd, description):
         print(f"   Error: {e.stderr}")
         return False
 
+def run_python_code(code, description):
+    """Run a snippet of Python source in a fresh interpreter."""
+    fd, script = tempfile.mkstemp(suffix=".py")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(code)
+        return run_command([sys.executable, script], description)
+    finally:
+        os.unlink(script)
+
+def pip_install_command(args):
+    """Build one pip install command for the given packages and options, without prompts."""
+    return [sys.executable, "-m", "pip", "install", "--no-input",
+            "--disable-pip-version-check", *args]
+
 def check_python_version():
     """Check if Python version is compatible."""
     version = sys.version_info
@@ -47,25 +63,25 @@ def install_package():
         return False
     
     # Upgrade pip
-    if not run_command(f"{sys.executable} -m pip install --upgrade pip", "Upgrading pip"):
+    if not run_command(pip_install_command(["--upgrade", "pip"]), "Upgrading pip"):
         return False
     
     # Install the package in development mode
-    if not run_command(f"{sys.executable} -m pip install -e .", "Installing BoE ETL package"):
+    if not run_command(pip_install_command(["-e", "."]), "Installing BoE ETL package"):
         return False
     
     # Install optional dependencies
     print("\n📦 Installing optional dependencies...")
     optional_deps = {
-        "frontend": "streamlit plotly",
-        "dev": "pytest pytest-cov black flake8",
-        "docs": "sphinx sphinx-rtd-theme"
+        "frontend": ["streamlit", "plotly"],
+        "dev": ["pytest", "pytest-cov", "black", "flake8"],
+        "docs": ["sphinx", "sphinx-rtd-theme"]
     }
     
     for category, deps in optional_deps.items():
-        choice = input(f"Install {category} dependencies? ({deps}) [y/N]: ").lower()
+        choice = input(f"Install {category} dependencies? ({' '.join(deps)}) [y/N]: ").lower()
         if choice in ['y', 'yes']:
-            run_command(f"{sys.executable} -m pip install {deps}", f"Installing {category} dependencies")
+            run_command(pip_install_command(deps), f"Installing {category} dependencies")
     
     # Test installation
     print("\n🧪 Testing installation...")
@@ -75,7 +91,7 @@ print(f"✅ BoE ETL version {boe_etl.__version__} installed successfully")
 print(f"📦 Available modules: {', '.join(boe_etl.__all__)}")
 """
     
-    if run_command(f"{sys.executable} -c \"{test_code}\"", "Testing package import"):
+    if run_python_code(test_code, "Testing package import"):
         print("\n🎉 Installation completed successfully!")
         print("\n📚 Quick start:")
         print("   from boe_etl import ETLPipeline")
@@ -9,14 +9,15 @@ This script sets up the BoE ETL system to work with your existing codebase.
 import subprocess
 import sys
 import os
+import tempfile
 import shutil
 from pathlib import Path
 
 def run_command(cmd, description):
-    """Run a command and handle errors."""
+    """Run a command (given as an argument list) and handle errors."""
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(cmd, shell=True, check=True, capture_output=True, text=True)
+        result = subprocess.run(cmd, shell=False, check=True, capture_output=True, text=True)
         print(f"✅ {description} completed successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -24,6 +25,21 @@ def run_command(cmd, description):
         print(f"   Error: {e.stderr}")
         return False
 
+def run_python_code(code, description):
+    """Run a snippet of Python source in a fresh interpreter."""
+    fd, script = tempfile.mkstemp(suffix=".py")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(code)
+        return run_command([sys.executable, script], description)
+    finally:
+        os.unlink(script)
+
+def pip_install_command(args):
+    """Build one pip install command for the given packages and options, without prompts."""
+    return [sys.executable, "-m", "pip", "install", "--no-input",
+            "--disable-pip-version-check", *args]
+
 def check_python_version():
     """Check if Python version is compatible."""
     version = sys.version_info
@@ -71,17 +87,15 @@ def install_dependencies():
         "jupyter": ["jupyter>=1.0.0", "ipykernel>=6.0.0"]
     }
     
-    # Install core dependencies
-    for dep in core_deps:
-        if not run_command(f"{sys.executable} -m pip install {dep}", f"Installing {dep}"):
-            return False
+    # Install core dependencies in a single resolver pass
+    if not run_command(pip_install_command(core_deps), "Installing core dependencies"):
+        return False
     
     # Ask about optional dependencies
     for category, deps in optional_deps.items():
         choice = input(f"Install {category} dependencies? ({', '.join(deps)}) [y/N]: ").lower()
         if choice in ['y', 'yes']:
-            for dep in deps:
-                run_command(f"{sys.executable} -m pip install {dep}", f"Installing {dep}")
+            run_command(pip_install_command(deps), f"Installing {category} dependencies")
     
     return True
 
@@ -158,7 +172,7 @@ except Exception as e:
     sys.exit(1)
 """
     
-    if run_command(f"{sys.executable} -c \"{test_code}\"", "Testing standalone setup"):
+    if run_python_code(test_code, "Testing standalone setup"):
         print("\n🎉 Standalone installation completed successfully!")
         print("\n📚 Quick start:")
         print("   import standalone_frontend")
@@ -8,19 +8,63 @@ making analytical assumptions or classifications.
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import os
 import json
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 import tempfile
+import io
+import zipfile
+import importlib
+import multiprocessing
+import pickle
+import hashlib
+from collections import deque
+from itertools import islice
 
 # Only use standard libraries and basic packages
+# PDF engines, fastest first: PyMuPDF (MuPDF in C), pypdfium2 (PDFium in C++),
+# then pypdf/PyPDF2
 try:
-    import PyPDF2
-    PDF_AVAILABLE = True
+    import pymupdf as fitz
+    PDF_ENGINE = 'pymupdf'
 except ImportError:
-    PDF_AVAILABLE = False
+    try:
+        import fitz
+        PDF_ENGINE = 'pymupdf'
+    except ImportError:
+        PDF_ENGINE = None
+
+if PDF_ENGINE is None:
+    try:
+        import pypdfium2 as pdfium
+        PDF_ENGINE = 'pdfium'
+    except ImportError:
+        pass
+
+if PDF_ENGINE is None:
+    try:
+        # pypdf is the maintained successor of PyPDF2 and faster per page
+        from pypdf import PdfReader
+        PDF_ENGINE = 'pypdf'
+    except ImportError:
+        try:
+            from PyPDF2 import PdfReader
+            PDF_ENGINE = 'pypdf'
+        except ImportError:
+            pass
+
+PDF_AVAILABLE = PDF_ENGINE is not None
+
+# Library that actually produced PDF text; pypdf and PyPDF2 share an engine
+# label but not their output, so the module name tells them apart
+if PDF_ENGINE == 'pypdf':
+    PDF_LIBRARY = PdfReader.__module__.split('.')[0]
+else:
+    PDF_LIBRARY = {'pymupdf': 'pymupdf', 'pdfium': 'pypdfium2'}.get(PDF_ENGINE, 'none')
 
 try:
     import openpyxl
@@ -28,6 +72,321 @@ try:
 except ImportError:
     EXCEL_AVAILABLE = False
 
+# Vocabulary scans use RE2's linear-time automaton when google-re2 is installed
+try:
+    import re2 as vocab_re
+except ImportError:
+    vocab_re = re
+
+# A single Aho-Corasick pass per row is preferred when pyahocorasick is installed
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Raw financial vocabulary (extraction only, no classification)
+FINANCIAL_VOCABULARY = [
+    'revenue', 'income', 'profit', 'earnings', 'billion', 'million', 
+    'eps', 'capital', 'assets', 'growth', 'performance', 'margin',
+    'return', 'yield', 'dividend', 'interest', 'loan', 'credit',
+    'deposit', 'fee', 'commission', 'expense', 'cost', 'investment',
+    'portfolio', 'risk', 'regulatory', 'compliance', 'basel',
+    'tier', 'ratio', 'liquidity', 'solvency', 'provision'
+]
+
+# Raw temporal language (not classified as actual/projection)
+TEMPORAL_TERMS = [
+    'expect', 'forecast', 'project', 'anticipate', 'estimate',
+    'guidance', 'outlook', 'target', 'goal', 'plan', 'intend',
+    'will be', 'should be', 'likely to', 'going forward',
+    'next quarter', 'next year', 'future', 'upcoming',
+    'reported', 'achieved', 'delivered', 'recorded', 'posted',
+    'was', 'were', 'had', 'generated', 'earned', 'realized',
+    'last quarter', 'previous', 'year-over-year', 'compared to'
+]
+
+def _terms_pattern(terms):
+    """Compile one alternation matching any term at the start of a word."""
+    # Longest first so no term is shadowed by a shorter one sharing its prefix;
+    # no trailing boundary, so inflections such as 'deposits' still match
+    alternation = '|'.join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+    return vocab_re.compile(r'(?i)\b(?:' + alternation + ')')
+
+def _terms_finder(terms):
+    """Build a function returning the vocabulary terms found in a lower-cased text."""
+    if not AHOCORASICK_AVAILABLE:
+        return _terms_pattern(terms).findall
+    
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    
+    def find(text_lower):
+        # Longest term starting at each word start (same boundary as the regex engines)
+        longest = {}
+        for end, term in automaton.iter(text_lower):
+            start = end - len(term) + 1
+            if start == 0 or not (text_lower[start - 1].isalnum() or text_lower[start - 1] == '_'):
+                if len(term) > len(longest.get(start, '')):
+                    longest[start] = term
+        
+        # Leftmost, longest-first and non-overlapping, like findall on the alternation
+        found = []
+        resume = 0
+        for start in sorted(longest):
+            if start >= resume:
+                term = longest[start]
+                found.append(term)
+                resume = start + len(term)
+        return found
+    
+    return find
+
+def _terms_joiner(terms):
+    """Build a function joining distinct matched terms in vocabulary order, or 'NONE'."""
+    rank = {term: i for i, term in enumerate(terms)}
+    
+    def join(found):
+        if not found:
+            return 'NONE'
+        return '|'.join(sorted({t.lower() for t in found}, key=rank.__getitem__))
+    
+    return join
+
+_find_financial_terms = _terms_finder(FINANCIAL_VOCABULARY)
+_find_temporal_terms = _terms_finder(TEMPORAL_TERMS)
+_join_financial_terms = _terms_joiner(FINANCIAL_VOCABULARY)
+_join_temporal_terms = _terms_joiner(TEMPORAL_TERMS)
+
+# Numerical figures, one alternative per kind, scanned in a single pass
+_FIGURES_RE = re.compile(
+    r'\$[\d,]+\.?\d*\s*(?:billion|million|thousand|B|M|K)?'  # Dollar amounts
+    r'|[\d,]+\.?\d*\s*(?:billion|million|thousand|percent|%|basis points|bps)'  # Numbers with units
+    r'|[\d,]+\.?\d*\s*(?:dollars|cents)'  # Dollar/cent amounts
+    # Approximate figures keep any unit that follows, which a separate scan
+    # used to report as a second figure
+    r'|(?:approximately|about|around|roughly)\s*[\d,]+\.?\d*'
+    r'(?:\s*(?:billion|million|thousand|percent|%|basis points|bps|dollars|cents))?',
+    re.IGNORECASE
+)
+
+def _join_figures(found):
+    """Join extracted figures, or 'NONE' when there are none."""
+    return '|'.join(found) if found else 'NONE'
+
+# Sentence segmentation and speaker patterns, compiled once per process
+_SENT_SPLIT_RE = re.compile(r'[.!?]+')
+_WS_RE = re.compile(r'\s+')
+# Speaker alternatives in priority order; exactly one group captures on a match
+_SPEAKER_RE = re.compile(
+    r'^(?:(?P<caps>[A-Z][A-Z\s]+)'  # ALL CAPS:
+    r'|(?P<name>[A-Z][a-z]+\s+[A-Z][a-z]+)'  # First Last:
+    r'|(?P<title>CEO|CFO|Chief Executive|Chief Financial|Chief Risk Officer)'  # Titles
+    r'):\s*'
+)
+
+# Every speaker pattern ends at the first colon; labels longer than this are
+# not treated as speakers, so most sentences skip the regex entirely
+_SPEAKER_WINDOW = 80
+
+# Bump whenever extraction or segmentation changes so cached uploads are re-parsed
+PIPELINE_VERSION = "1"
+
+# Size budget for pure_etl_outputs/cache; least recently used entries go first
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Columns with a handful of distinct values across a dataset
+CATEGORY_COLUMNS = ['speaker_raw', 'source_type', 'institution', 'quarter', 'source_file', 'call_id']
+
+def _fill_labels(series, fill):
+    """Fill missing labels, keeping categorical columns categorical."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        if fill not in series.cat.categories:
+            series = series.cat.add_categories([fill])
+        return series.fillna(fill)
+    return series.fillna(fill).astype(str)
+
+def extract_pdf_text(file_path):
+    """Extract text from PDF (a path or a binary file object)."""
+    if not PDF_AVAILABLE:
+        return "PDF processing not available. Install pymupdf, pypdfium2 or pypdf."
+    
+    try:
+        if PDF_ENGINE == 'pymupdf':
+            if hasattr(file_path, 'read'):
+                doc = fitz.open(stream=file_path.read(), filetype='pdf')
+            else:
+                doc = fitz.open(file_path)
+            with doc:
+                return "\n".join(page.get_text() for page in doc)
+    
+        if PDF_ENGINE == 'pdfium':
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                parts = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    parts.append(textpage.get_text_range())
+                    textpage.close()
+                    page.close()
+                return "\n".join(parts)
+            finally:
+                pdf.close()
+    
+        pdf_reader = PdfReader(file_path, strict=False)
+        return "\n".join(page.extract_text() or "" for page in pdf_reader.pages)
+    except Exception as e:
+        return f"Error reading PDF: {str(e)}"
+
+def extract_excel_text(file_path):
+    """Extract text from Excel (a path or a binary file object)."""
+    if not EXCEL_AVAILABLE:
+        return "Excel processing not available. Install openpyxl."
+    
+    # .xlsx workbooks are zip archives; openpyxl cannot open legacy .xls
+    # workbooks, so those go through pandas
+    if zipfile.is_zipfile(file_path):
+        return _extract_xlsx_text(file_path)
+    if hasattr(file_path, 'seek'):
+        file_path.seek(0)
+    
+    try:
+        parts = []
+        df_dict = pd.read_excel(file_path, sheet_name=None)
+        for sheet_name, df in df_dict.items():
+            parts.append(f"Sheet: {sheet_name}")
+            # Plain tuples; iterrows boxes every row into a Series
+            rows = (" ".join(str(val) for val in row if pd.notna(val))
+                    for row in df.itertuples(index=False, name=None))
+            parts.extend(row_text for row_text in rows if row_text.strip())
+            parts.append("")
+        return "\n".join(parts)
+    except Exception as e:
+        return f"Error reading Excel: {str(e)}"
+
+def _extract_xlsx_text(file_path):
+    """Stream cell values from an .xlsx workbook in read-only mode."""
+    try:
+        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            parts = []
+            for ws in wb.worksheets:
+                parts.append(f"Sheet: {ws.title}")
+                for row in ws.iter_rows(values_only=True):
+                    row_text = " ".join(str(val) for val in row if val is not None)
+                    if row_text.strip():
+                        parts.append(row_text)
+                parts.append("")
+        finally:
+            wb.close()
+        return "\n".join(parts)
+    except Exception as e:
+        return f"Error reading Excel: {str(e)}"
+
+def extract_text_file(file_path):
+    """Extract text from text file (a path or a binary file object)."""
+    try:
+        if hasattr(file_path, 'read'):
+            data = file_path.read()
+        else:
+            data = Path(file_path).read_bytes()
+        try:
+            return data.decode('utf-8')
+        except UnicodeDecodeError:
+            return data.decode('latin-1')
+    except Exception as e:
+        return f"Error reading text file: {str(e)}"
+
+def extract_upload(name, data):
+    """Extract text from one upload held in memory; returns (name, text, doc_type)."""
+    source = io.BytesIO(data)
+    if name.lower().endswith('.pdf'):
+        text = extract_pdf_text(source)
+    elif name.lower().endswith(('.xlsx', '.xls')):
+        text = extract_excel_text(source)
+    elif name.lower().endswith('.txt'):
+        text = extract_text_file(source)
+    else:
+        text = f"Unsupported file type: {name}"
+    
+    doc_type = classify_document_type(name, text) if text else None
+    return name, text, doc_type
+
+def classify_document_type(filename, text):
+    """Enhanced document type classification based on filename and content patterns."""
+    filename_lower = filename.lower()
+    
+    # More specific filename patterns
+    if any(term in filename_lower for term in ['presentation', 'slides', 'deck']):
+        return 'earnings_presentation'
+    elif any(term in filename_lower for term in ['supplement', 'financial_supplement', 'fin_supp']):
+        return 'financial_supplement'
+    elif any(term in filename_lower for term in ['transcript', 'earnings_call', 'call_transcript']):
+        return 'earnings_call'
+    elif any(term in filename_lower for term in ['report', 'quarterly_report', 'annual_report']):
+        return 'financial_report'
+    elif any(term in filename_lower for term in ['press_release', 'release', 'announcement']):
+        return 'press_release'
+    
+    # Content checks only; lower-case the document once, and only if needed
+    text_lower = text.lower()
+    if filename_lower.endswith(('.xlsx', '.xls')):
+        # Excel files are likely financial supplements or data
+        if any(term in text_lower for term in ['balance sheet', 'income statement', 'cash flow']):
+            return 'financial_supplement'
+        else:
+            return 'financial_data'
+    elif filename_lower.endswith('.pdf'):
+        # PDF content analysis - more specific patterns
+        if ('transcript' in text_lower and any(term in text_lower for term in ['operator:', 'moderator:', 'q&a'])):
+            return 'earnings_call'
+        elif any(term in text_lower for term in ['slide', 'presentation', 'agenda']):
+            return 'earnings_presentation'
+        elif any(term in text_lower for term in ['balance sheet', 'income statement', 'financial highlights']):
+            return 'financial_supplement'
+        elif any(term in text_lower for term in ['press release', 'announces', 'reported earnings']):
+            return 'press_release'
+        else:
+            return 'financial_document'
+    else:
+        # Text files and others
+        if any(term in text_lower for term in ['transcript', 'operator:', 'moderator:', 'q&a session']):
+            return 'earnings_call'
+        else:
+            return 'text_document'
+
+def _upload_extractor():
+    """Return extract_upload from a module that worker processes can import.
+    
+    Streamlit executes this file as __main__, which child processes cannot
+    resolve pickled functions against; importing it under its own name gives
+    them a real module path. Returns None if neither copy can be pickled.
+    """
+    try:
+        pickle.dumps(extract_upload)
+        return extract_upload
+    except Exception:
+        pass
+    try:
+        worker = importlib.import_module(Path(__file__).stem).extract_upload
+        pickle.dumps(worker)
+        return worker
+    except Exception:
+        return None
+
+# Most recent runs kept in memory; the history file itself is append-only
+HISTORY_LIMIT = 200
+
+# Uncached upload bytes needed before extraction moves to worker processes;
+# each spawned worker re-imports pandas, streamlit and the PDF engine, which
+# costs more than parsing a few small files on one thread
+PROCESS_POOL_MIN_BYTES = 8 * 1024 * 1024
+
+# Largest output offered through st.download_button, in bytes
+DOWNLOAD_SIZE_LIMIT = 200 * 1024 * 1024
+
 class PureETL:
     """Pure data engineering ETL - extraction and structuring only."""
     
@@ -40,350 +399,365 @@ class PureETL:
         """Setup required directories."""
         self.upload_dir = Path("pure_etl_uploads")
         self.output_dir = Path("pure_etl_outputs")
-        self.history_file = Path("pure_etl_history.json")
+        self.history_file = Path("pure_etl_history.jsonl")
+        self.legacy_history_file = Path("pure_etl_history.json")
+        self.cache_dir = self.output_dir / "cache"
         
         self.upload_dir.mkdir(exist_ok=True)
         self.output_dir.mkdir(exist_ok=True)
+        self.cache_dir.mkdir(exist_ok=True)
     
     def load_history(self):
-        """Load processing history."""
-        if self.history_file.exists():
+        """Load the most recent runs, newest first."""
+        self.history = deque(maxlen=HISTORY_LIMIT)
+        
+        # One-time migration from the old single-document JSON history
+        if not self.history_file.exists() and self.legacy_history_file.exists():
             try:
-                with open(self.history_file, 'r') as f:
-                    self.history = json.load(f)
+                with open(self.legacy_history_file, 'r') as f:
+                    legacy = json.load(f)
+                with open(self.history_file, 'w') as f:
+                    for record in reversed(legacy):
+                        f.write(json.dumps(record, default=str) + '\n')
             except:
-                self.history = []
-        else:
-            self.history = []
+                pass
+        
+        if self.history_file.exists():
+            try:
+                with open(self.history_file, 'r', errors='replace') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        # Skip a corrupt or half-written line rather than every run after it
+                        try:
+                            self.history.appendleft(json.loads(line))
+                        except ValueError:
+                            continue
+            except OSError:
+                pass
     
-    def save_history(self):
-        """Save processing history."""
-        with open(self.history_file, 'w') as f:
-            json.dump(self.history, f, indent=2, default=str)
+    def save_history(self, record):
+        """Record a run, appending one line to the history file."""
+        self.history.appendleft(record)
+        with open(self.history_file, 'a') as f:
+            f.write(json.dumps(record, default=str) + '\n')
     
     def extract_pdf_text(self, file_path):
-        """Extract text from PDF."""
-        if not PDF_AVAILABLE:
-            return "PDF processing not available. Install PyPDF2."
-        
-        try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            return text
-        except Exception as e:
-            return f"Error reading PDF: {str(e)}"
+        """Extract text from PDF (a path or a binary file object)."""
+        return extract_pdf_text(file_path)
     
     def extract_excel_text(self, file_path):
-        """Extract text from Excel."""
-        if not EXCEL_AVAILABLE:
-            return "Excel processing not available. Install openpyxl."
-        
-        try:
-            text = ""
-            df_dict = pd.read_excel(file_path, sheet_name=None)
-            for sheet_name, df in df_dict.items():
-                text += f"Sheet: {sheet_name}\n"
-                for _, row in df.iterrows():
-                    row_text = " ".join([str(val) for val in row.values if pd.notna(val)])
-                    if row_text.strip():
-                        text += row_text + "\n"
-                text += "\n"
-            return text
-        except Exception as e:
-            return f"Error reading Excel: {str(e)}"
+        """Extract text from Excel (a path or a binary file object)."""
+        return extract_excel_text(file_path)
     
     def extract_text_file(self, file_path):
-        """Extract text from text file."""
+        """Extract text from text file (a path or a binary file object)."""
+        return extract_text_file(file_path)
+    
+    def _cache_key(self, name, data):
+        """Content-addressed key for an upload; the name feeds document typing."""
+        digest = hashlib.sha256(name.encode('utf-8') + b'\0' + data).hexdigest()
+        # PDF text depends on the engine, so installing or removing one re-parses
+        if name.lower().endswith('.pdf'):
+            return f"{digest}_{PIPELINE_VERSION}_{PDF_LIBRARY}"
+        return f"{digest}_{PIPELINE_VERSION}"
+    
+    def _load_cached(self, key):
+        """Return cached (sentences, doc_type) for a key, or None."""
+        cache_file = self.cache_dir / f"{key}.parquet"
+        if not cache_file.exists():
+            return None
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except UnicodeDecodeError:
+            cached = pd.read_parquet(cache_file)
+            # Mark as recently used for _prune_cache
+            os.utime(cache_file)
+        except Exception:
+            return None
+        return cached['text'].tolist(), cached['source_type'].iat[0]
+    
+    def _store_cached(self, key, sentences, doc_type):
+        """Write segmented sentences for a key; the cache is best-effort."""
+        try:
+            pd.DataFrame({'text': sentences, 'source_type': doc_type}).to_parquet(
+                self.cache_dir / f"{key}.parquet", index=False)
+        except Exception:
+            pass
+    
+    def _prune_cache(self, max_bytes=CACHE_MAX_BYTES):
+        """Delete least recently used cache entries until the cache fits max_bytes."""
+        try:
+            entries = []
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith('.parquet'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
             try:
-                with open(file_path, 'r', encoding='latin-1') as f:
-                    return f.read()
-            except Exception as e:
-                return f"Error reading text file: {str(e)}"
-        except Exception as e:
-            return f"Error reading text file: {str(e)}"
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
     
     def segment_sentences(self, text):
         """Simple sentence segmentation."""
-        # Split on sentence endings
-        sentences = re.split(r'[.!?]+', text)
-        
-        # Clean sentences
-        clean_sentences = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            sentence = re.sub(r'\s+', ' ', sentence)  # Normalize whitespace
-            if len(sentence) > 10:  # Minimum length
-                clean_sentences.append(sentence)
-        
-        return clean_sentences
+        # Split on sentence endings, normalize whitespace, keep a minimum length
+        cleaned = (_WS_RE.sub(' ', sentence.strip()) for sentence in _SENT_SPLIT_RE.split(text))
+        return [sentence for sentence in cleaned if len(sentence) > 10]
     
     def extract_speaker_raw(self, text):
         """Extract speaker patterns without classification."""
         # Look for speaker patterns at start of text
-        patterns = [
-            r'^([A-Z][A-Z\s]+):\s*',  # ALL CAPS:
-            r'^([A-Z][a-z]+\s+[A-Z][a-z]+):\s*',  # First Last:
-            r'^(CEO|CFO|Chief Executive|Chief Financial|Chief Risk Officer):\s*',  # Titles
-        ]
+        colon = text.find(':', 0, _SPEAKER_WINDOW)
+        if colon < 0:
+            return 'UNKNOWN'
         
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                return match.group(1).strip()
+        match = _SPEAKER_RE.match(text, 0, colon + 1)
+        if match:
+            return match.group(match.lastgroup).strip()
         
         return 'UNKNOWN'
     
+    def extract_speakers_raw(self, texts):
+        """Vectorized extract_speaker_raw over a Series of sentences."""
+        speakers = pd.Series('UNKNOWN', index=texts.index, dtype=object)
+        candidates = texts[texts.str.slice(0, _SPEAKER_WINDOW).str.contains(':', regex=False)]
+        if len(candidates):
+            groups = candidates.str.extract(_SPEAKER_RE, expand=True)
+            found = groups.bfill(axis=1).iloc[:, 0].str.strip()
+            speakers[found.index] = found.fillna('UNKNOWN')
+        return speakers
+    
     def classify_document_type(self, filename, text):
         """Enhanced document type classification based on filename and content patterns."""
-        filename_lower = filename.lower()
-        text_lower = text.lower()
-        
-        # More specific filename patterns
-        if any(term in filename_lower for term in ['presentation', 'slides', 'deck']):
-            return 'earnings_presentation'
-        elif any(term in filename_lower for term in ['supplement', 'financial_supplement', 'fin_supp']):
-            return 'financial_supplement'
-        elif any(term in filename_lower for term in ['transcript', 'earnings_call', 'call_transcript']):
-            return 'earnings_call'
-        elif any(term in filename_lower for term in ['report', 'quarterly_report', 'annual_report']):
-            return 'financial_report'
-        elif any(term in filename_lower for term in ['press_release', 'release', 'announcement']):
-            return 'press_release'
-        elif filename_lower.endswith(('.xlsx', '.xls')):
-            # Excel files are likely financial supplements or data
-            if any(term in text_lower for term in ['balance sheet', 'income statement', 'cash flow']):
-                return 'financial_supplement'
-            else:
-                return 'financial_data'
-        elif filename_lower.endswith('.pdf'):
-            # PDF content analysis - more specific patterns
-            if ('transcript' in text_lower and any(term in text_lower for term in ['operator:', 'moderator:', 'q&a'])):
-                return 'earnings_call'
-            elif any(term in text_lower for term in ['slide', 'presentation', 'agenda']):
-                return 'earnings_presentation'
-            elif any(term in text_lower for term in ['balance sheet', 'income statement', 'financial highlights']):
-                return 'financial_supplement'
-            elif any(term in text_lower for term in ['press release', 'announces', 'reported earnings']):
-                return 'press_release'
-            else:
-                return 'financial_document'
-        else:
-            # Text files and others
-            if any(term in text_lower for term in ['transcript', 'operator:', 'moderator:', 'q&a session']):
-                return 'earnings_call'
-            else:
-                return 'text_document'
+        return classify_document_type(filename, text)
     
-    def extract_raw_features(self, df):
+    def extract_raw_features(self, df, ensure_complete=False):
         """Extract raw features without analytical assumptions."""
         
-        # Handle missing values first
-        df['text'] = df['text'].fillna('').astype(str)
-        df['speaker_raw'] = df['speaker_raw'].fillna('UNKNOWN').astype(str)
+        # Handle missing and non-string text first (process_files produces
+        # neither, so its frames skip the copy)
+        if df['text'].isna().any() or pd.api.types.infer_dtype(df['text'], skipna=False) != 'string':
+            df['text'] = df['text'].fillna('').astype(str)
+        if df['speaker_raw'].isna().any():
+            df['speaker_raw'] = _fill_labels(df['speaker_raw'], 'UNKNOWN')
         
-        # Basic text metrics
-        df['word_count'] = df['text'].str.split().str.len().fillna(0).astype(int)
-        df['char_count'] = df['text'].str.len().fillna(0).astype(int)
+        # Basic text metrics; counting runs of non-whitespace matches
+        # len(text.split()) without building a word list per row
+        char_count = df['text'].str.len().to_numpy()
+        df['word_count'] = df['text'].str.count(r'\S+').to_numpy()
+        df['char_count'] = char_count
         df['sentence_length'] = df['word_count']  # Alias for clarity
         
-        # Raw financial terms extraction (no classification)
-        financial_vocabulary = [
-            'revenue', 'income', 'profit', 'earnings', 'billion', 'million', 
-            'eps', 'capital', 'assets', 'growth', 'performance', 'margin',
-            'return', 'yield', 'dividend', 'interest', 'loan', 'credit',
-            'deposit', 'fee', 'commission', 'expense', 'cost', 'investment',
-            'portfolio', 'risk', 'regulatory', 'compliance', 'basel',
-            'tier', 'ratio', 'liquidity', 'solvency', 'provision'
-        ]
-        
-        def extract_terms_found(text):
-            """Extract terms found without interpretation."""
-            if pd.isna(text) or text == '':
-                return 'NONE'
-            
-            text_lower = str(text).lower()
-            found_terms = []
-            for term in financial_vocabulary:
-                if term in text_lower:
-                    found_terms.append(term)
-            return '|'.join(found_terms) if found_terms else 'NONE'
+        # One pass over the text column feeds all three raw extractions
+        financial_found, figures_found, temporal_found = [], [], []
+        for text in df['text']:
+            text_lower = text.lower()
+            financial_found.append(_find_financial_terms(text_lower))
+            figures_found.append(_FIGURES_RE.findall(text))
+            temporal_found.append(_find_temporal_terms(text_lower))
         
-        df['all_financial_terms'] = df['text'].apply(extract_terms_found)
+        # Raw financial terms extraction (no classification)
+        df['all_financial_terms'] = [_join_financial_terms(found) for found in financial_found]
         
         # Raw financial figures extraction (no interpretation)
-        def extract_figures_found(text):
-            """Extract numerical figures without interpretation."""
-            if pd.isna(text) or text == '':
-                return 'NONE'
-                
-            import re
-            text_str = str(text)
-            
-            # Patterns for numerical figures
-            patterns = [
-                r'\$[\d,]+\.?\d*\s*(?:billion|million|thousand|B|M|K)?',  # Dollar amounts
-                r'[\d,]+\.?\d*\s*(?:billion|million|thousand|percent|%|basis points|bps)',  # Numbers with units
-                r'[\d,]+\.?\d*\s*(?:dollars|cents)',  # Dollar/cent amounts
-                r'(?:approximately|about|around|roughly)\s*[\d,]+\.?\d*',  # Approximate figures
-            ]
-            
-            figures = []
-            for pattern in patterns:
-                matches = re.findall(pattern, text_str, re.IGNORECASE)
-                figures.extend(matches)
-            
-            return '|'.join(figures) if figures else 'NONE'
-        
-        df['financial_figures'] = df['text'].apply(extract_figures_found)
-        df['financial_figures_text'] = df['financial_figures']  # Compatibility
+        df['financial_figures'] = [_join_figures(found) for found in figures_found]
         
         # Raw temporal indicators (no classification)
-        def extract_temporal_indicators(text):
-            """Extract temporal language without classifying as actual/projection."""
-            if pd.isna(text) or text == '':
-                return 'NONE'
-                
-            text_lower = str(text).lower()
-            
-            temporal_terms = [
-                'expect', 'forecast', 'project', 'anticipate', 'estimate',
-                'guidance', 'outlook', 'target', 'goal', 'plan', 'intend',
-                'will be', 'should be', 'likely to', 'going forward',
-                'next quarter', 'next year', 'future', 'upcoming',
-                'reported', 'achieved', 'delivered', 'recorded', 'posted',
-                'was', 'were', 'had', 'generated', 'earned', 'realized',
-                'last quarter', 'previous', 'year-over-year', 'compared to'
-            ]
-            
-            found_terms = []
-            for term in temporal_terms:
-                if term in text_lower:
-                    found_terms.append(term)
-            
-            return '|'.join(found_terms) if found_terms else 'NONE'
+        df['temporal_indicators'] = [_join_temporal_terms(found) for found in temporal_found]
         
-        df['temporal_indicators'] = df['text'].apply(extract_temporal_indicators)
+        # Basic boolean flags (factual, not interpretive), taken from the
+        # match lists rather than by comparing the joined strings to 'NONE'
+        df['has_financial_terms'] = np.fromiter(map(bool, financial_found), dtype=bool, count=len(df))
+        df['has_financial_figures'] = np.fromiter(map(bool, figures_found), dtype=bool, count=len(df))
+        df['has_temporal_language'] = np.fromiter(map(bool, temporal_found), dtype=bool, count=len(df))
+        df['has_speaker_identified'] = (df['speaker_raw'] != 'UNKNOWN').to_numpy(dtype=bool)
+        df['is_empty_text'] = char_count == 0
         
-        # Basic boolean flags (factual, not interpretive)
-        df['has_financial_terms'] = (df['all_financial_terms'] != 'NONE').astype(bool)
-        df['has_financial_figures'] = (df['financial_figures'] != 'NONE').astype(bool)
-        df['has_temporal_language'] = (df['temporal_indicators'] != 'NONE').astype(bool)
-        df['has_speaker_identified'] = (df['speaker_raw'] != 'UNKNOWN').astype(bool)
-        df['is_empty_text'] = (df['text'] == '').astype(bool)
-        
-        # Ensure no missing values
-        self._ensure_no_missing_values(df)
+        # Columns built above are complete by construction; frames assembled
+        # elsewhere can opt in to a full gap check
+        if ensure_complete:
+            self._ensure_no_missing_values(df)
         
         return df
     
     def _ensure_no_missing_values(self, df):
         """Ensure no missing values for downstream processing."""
+        # Only columns that actually hold gaps (or the wrong dtype) are
+        # rewritten; frames from extract_raw_features are already clean
         
         # String columns
-        string_cols = ['all_financial_terms', 'financial_figures', 'financial_figures_text', 
-                      'temporal_indicators', 'speaker_raw', 'text', 'source_file', 
-                      'institution', 'quarter', 'source_type']
+        string_cols = ['all_financial_terms', 'financial_figures', 'temporal_indicators', 
+                      'speaker_raw', 'text', 'source_file', 'institution', 'quarter', 
+                      'source_type']
         
         for col in string_cols:
-            if col in df.columns:
-                df[col] = df[col].fillna('NONE' if 'financial' in col or 'temporal' in col else 'UNKNOWN').astype(str)
+            if col in df.columns and df[col].isna().any():
+                df[col] = _fill_labels(df[col], 'NONE' if 'financial' in col or 'temporal' in col else 'UNKNOWN')
         
         # Numeric columns
         numeric_cols = ['word_count', 'char_count', 'sentence_length', 'sentence_id']
         for col in numeric_cols:
-            if col in df.columns:
+            if col in df.columns and (df[col].isna().any() or not pd.api.types.is_integer_dtype(df[col])):
                 df[col] = df[col].fillna(0).astype(int)
         
         # Boolean columns
         boolean_cols = ['has_financial_terms', 'has_financial_figures', 'has_temporal_language', 
                        'has_speaker_identified', 'is_empty_text']
         for col in boolean_cols:
-            if col in df.columns:
+            if col in df.columns and (df[col].isna().any() or not pd.api.types.is_bool_dtype(df[col])):
                 df[col] = df[col].fillna(False).astype(bool)
         
         return df
     
-    def process_files(self, institution, quarter, uploaded_files, progress_callback=None, uploaded_by="Unknown"):
-        """Process uploaded files with pure ETL approach."""
+    def process_files(self, institution, quarter, uploaded_files, progress_callback=None, uploaded_by="Unknown",
+                      export_csv=False, archive_uploads=False):
+        """Process uploaded files with pure ETL approach.
+        
+        The ``file_path`` column holds the path of the archived copy of each
+        upload, and is null when ``archive_uploads`` is False since nothing
+        is written to disk; ``source_file`` always holds the upload name.
+        """
         try:
             # Create processing directory
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            started = datetime.now()
+            timestamp = started.strftime("%Y%m%d_%H%M%S")
+            started_iso = started.isoformat()
             process_dir = self.upload_dir / f"{institution}_{quarter}_{timestamp}"
-            process_dir.mkdir(exist_ok=True)
+            if archive_uploads:
+                process_dir.mkdir(exist_ok=True)
             
-            all_records = []
             file_names = []
             
             if progress_callback:
                 progress_callback(0.1, "Saving uploaded files...")
             
-            # Process each file
-            for i, uploaded_file in enumerate(uploaded_files):
-                file_path = process_dir / uploaded_file.name
-                
-                # Save file
-                with open(file_path, 'wb') as f:
-                    f.write(uploaded_file.getbuffer())
-                
+            # Parse uploads from memory; they are only written to disk when
+            # archival is requested. Identical uploads are served from cache.
+            uploads = []
+            file_paths = []
+            cache_keys = []
+            for uploaded_file in uploaded_files:
+                data = uploaded_file.getbuffer()
+                if archive_uploads:
+                    file_path = process_dir / uploaded_file.name
+                    with open(file_path, 'wb') as f:
+                        f.write(data)
+                else:
+                    file_path = None
+                uploads.append(data)
+                file_paths.append(file_path)
                 file_names.append(uploaded_file.name)
-                
-                if progress_callback:
-                    progress_callback(0.2 + (i * 0.4 / len(uploaded_files)), 
-                                    f"Processing {uploaded_file.name}...")
-                
-                # Extract text based on file type
-                if uploaded_file.name.lower().endswith('.pdf'):
-                    text = self.extract_pdf_text(file_path)
-                elif uploaded_file.name.lower().endswith(('.xlsx', '.xls')):
-                    text = self.extract_excel_text(file_path)
-                elif uploaded_file.name.lower().endswith('.txt'):
-                    text = self.extract_text_file(file_path)
+                cache_keys.append(self._cache_key(uploaded_file.name, data))
+            
+            cached = [self._load_cached(key) for key in cache_keys]
+            pending = [i for i, hit in enumerate(cached) if hit is None]
+            
+            # Extract text from large batches of uncached files in worker
+            # processes, since the pure-Python parsers hold the GIL; progress
+            # and Streamlit calls stay on this thread
+            extracted = [None] * len(file_paths)
+            pending_bytes = sum(len(uploads[i]) for i in pending)
+            worker = None
+            if len(pending) > 1 and pending_bytes >= PROCESS_POOL_MIN_BYTES:
+                worker = _upload_extractor()
+            if worker is not None:
+                # Spawn rather than fork: forking Streamlit's threaded server can
+                # copy locks held by other threads into the children
+                executor = ProcessPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1),
+                                               mp_context=multiprocessing.get_context('spawn'))
+                payloads = {i: bytes(uploads[i]) for i in pending}
+            else:
+                worker = extract_upload
+                executor = ThreadPoolExecutor(max_workers=1)
+                payloads = {i: uploads[i] for i in pending}
+            with executor:
+                futures = {executor.submit(worker, file_names[i], payloads[i]): i
+                           for i in pending}
+                done = len(file_paths) - len(pending)
+                for future in as_completed(futures):
+                    result = future.result()
+                    extracted[futures[future]] = result
+                    done += 1
+                    if progress_callback:
+                        progress_callback(0.2 + (done * 0.4 / len(file_paths)), 
+                                        f"Processing {result[0]}...")
+            
+            # Segment in upload order, then size the columns before filling them
+            segmented = []
+            stored = False
+            for i, file_path in enumerate(file_paths):
+                name = file_names[i]
+                if cached[i] is not None:
+                    sentences, doc_type = cached[i]
                 else:
-                    text = f"Unsupported file type: {uploaded_file.name}"
-                
-                if not text or text.startswith("Error") or len(text.strip()) < 10:
-                    st.warning(f"Could not extract meaningful text from {uploaded_file.name}")
-                    continue
-                
-                # Segment into sentences
-                sentences = self.segment_sentences(text)
-                
-                # Create records
-                doc_type = self.classify_document_type(uploaded_file.name, text)
-                
-                for idx, sentence in enumerate(sentences):
-                    speaker = self.extract_speaker_raw(sentence)
+                    _, text, doc_type = extracted[i]
+                    if not text or text.startswith("Error") or len(text.strip()) < 10:
+                        st.warning(f"Could not extract meaningful text from {name}")
+                        continue
                     
-                    record = {
-                        'source_file': uploaded_file.name,
-                        'institution': institution,
-                        'quarter': quarter,
-                        'sentence_id': idx + 1,
-                        'speaker_raw': speaker,
-                        'text': sentence,
-                        'source_type': doc_type,
-                        'call_id': f"{institution}_{quarter}_{timestamp}",
-                        'file_path': str(file_path),
-                        'processing_date': datetime.now().isoformat(),
-                        'extraction_timestamp': datetime.now().isoformat()
-                    }
-                    all_records.append(record)
+                    # Segment into sentences
+                    sentences = self.segment_sentences(text)
+                    if sentences:
+                        self._store_cached(cache_keys[i], sentences, doc_type)
+                        stored = True
+                
+                segmented.append((name, str(file_path) if file_path else None, sentences, doc_type))
             
-            if not all_records:
+            if stored:
+                self._prune_cache()
+            
+            total = sum(len(sentences) for _, _, sentences, _ in segmented)
+            if not total:
                 raise Exception("No text content could be extracted from uploaded files")
             
             if progress_callback:
                 progress_callback(0.7, "Creating structured dataset...")
             
+            # Per-sentence columns; values shared by every row are added as scalars
+            source_files = np.empty(total, dtype=object)
+            sentence_ids = np.empty(total, dtype=np.int64)
+            texts = np.empty(total, dtype=object)
+            source_types = np.empty(total, dtype=object)
+            record_paths = np.empty(total, dtype=object)
+            
+            pos = 0
+            for name, record_path, sentences, doc_type in segmented:
+                end = pos + len(sentences)
+                source_files[pos:end] = name
+                sentence_ids[pos:end] = np.arange(1, len(sentences) + 1)
+                texts[pos:end] = sentences
+                source_types[pos:end] = doc_type
+                record_paths[pos:end] = record_path
+                pos = end
+            
             # Create DataFrame
-            df = pd.DataFrame(all_records)
+            df = pd.DataFrame({
+                'source_file': source_files,
+                'institution': institution,
+                'quarter': quarter,
+                'sentence_id': sentence_ids,
+                'text': texts,
+                'source_type': source_types,
+                'call_id': f"{institution}_{quarter}_{timestamp}",
+                'file_path': pd.array(record_paths, dtype='string'),
+                'processing_date': started_iso,
+                'extraction_timestamp': started_iso
+            }, copy=False)
+            
+            # Speakers in one regex pass over the whole column
+            df.insert(df.columns.get_loc('sentence_id') + 1, 'speaker_raw',
+                      self.extract_speakers_raw(df['text']))
+            
+            # Low-cardinality labels are stored once per distinct value
+            for col in CATEGORY_COLUMNS:
+                df[col] = df[col].astype('category')
             
             # Add raw features (no analysis)
             if progress_callback:
@@ -399,15 +773,21 @@ class PureETL:
             
             # Pure ETL dataset with taxonomy naming
             quarter_clean = quarter.replace(" ", "_")
-            etl_file = output_dir / f"{institution}_{quarter_clean}_PureETL_{uploaded_by}_{timestamp}.csv"
-            df.to_csv(etl_file, index=False)
+            etl_file = output_dir / f"{institution}_{quarter_clean}_PureETL_{uploaded_by}_{timestamp}.parquet"
+            df.to_parquet(etl_file, engine='pyarrow', compression='snappy', index=False)
             output_files.append(str(etl_file))
             
+            # Optional CSV copy for spreadsheet users
+            if export_csv:
+                csv_file = etl_file.with_suffix('.csv')
+                df.to_csv(csv_file, index=False)
+                output_files.append(str(csv_file))
+            
             if progress_callback:
                 progress_callback(1.0, "ETL processing complete!")
             
             # Add to history
-            self.history.insert(0, {
+            self.save_history({
                 'timestamp': datetime.now().isoformat(),
                 'institution': institution,
                 'quarter': quarter,
@@ -418,7 +798,6 @@ class PureETL:
                 'record_count': len(df),
                 'approach': 'Pure ETL - Standardized taxonomy'
             })
-            self.save_history()
             
             return output_files, len(df), "Success"
             
@@ -426,7 +805,7 @@ class PureETL:
             error_msg = str(e)
             
             # Add failed record to history
-            self.history.insert(0, {
+            self.save_history({
                 'timestamp': datetime.now().isoformat(),
                 'institution': institution,
                 'quarter': quarter,
@@ -438,7 +817,6 @@ class PureETL:
                 'error': error_msg,
                 'approach': 'Pure ETL - Standardized taxonomy'
             })
-            self.save_history()
             
             return [], 0, error_msg
 
@@ -464,13 +842,13 @@ def main():
     # Check dependencies
     missing_deps = []
     if not PDF_AVAILABLE:
-        missing_deps.append("PyPDF2 (for PDF processing)")
+        missing_deps.append("pymupdf, pypdfium2 or pypdf (for PDF processing)")
     if not EXCEL_AVAILABLE:
         missing_deps.append("openpyxl (for Excel processing)")
     
     if missing_deps:
         st.warning(f"Optional dependencies missing: {', '.join(missing_deps)}")
-        st.info("Install with: `pip install PyPDF2 openpyxl`")
+        st.info("Install with: `pip install pypdf openpyxl`")
     
     # Sidebar
     with st.sidebar:
@@ -515,6 +893,18 @@ def main():
             help="Your name/ID (CamelCase format)"
         )
         
+        # Output format
+        export_csv = st.checkbox(
+            "Also export CSV",
+            value=False,
+            help="Parquet is always written; CSV is larger and slower to write"
+        )
+        archive_uploads = st.checkbox(
+            "Archive uploaded files",
+            value=False,
+            help="Keep a copy of each upload under pure_etl_uploads"
+        )
+        
         # Combine quarter and year for processing
         quarter_year = f"{quarter} {year}"
         
@@ -561,7 +951,8 @@ def main():
                 
                 # Process files
                 output_files, record_count, status = etl.process_files(
-                    institution, quarter_year, uploaded_files, update_progress, uploaded_by
+                    institution, quarter_year, uploaded_files, update_progress, uploaded_by,
+                    export_csv=export_csv, archive_uploads=archive_uploads
                 )
                 
                 if status == "Success":
@@ -572,14 +963,23 @@ def main():
                     st.subheader("📥 Download Pure ETL Dataset")
                     for output_file in output_files:
                         file_path = Path(output_file)
-                        if file_path.exists():
-                            with open(file_path, 'rb') as f:
-                                st.download_button(
-                                    label=f"📄 Download {file_path.name}",
-                                    data=f.read(),
-                                    file_name=file_path.name,
-                                    mime="text/csv"
-                                )
+                        if not file_path.exists():
+                            continue
+                        
+                        # The button holds its payload in server memory, so
+                        # very large outputs are pointed to on disk instead
+                        size = file_path.stat().st_size
+                        if size > DOWNLOAD_SIZE_LIMIT:
+                            st.info(f"📄 {file_path.name} is {size / (1024 * 1024):.0f} MB; "
+                                    f"collect it from `{file_path.resolve()}`")
+                            continue
+                        
+                        st.download_button(
+                            label=f"📄 Download {file_path.name}",
+                            data=file_path.read_bytes(),
+                            file_name=file_path.name,
+                            mime="text/csv" if file_path.suffix == '.csv' else "application/octet-stream"
+                        )
                 else:
                     st.error(f"❌ ETL processing failed: {status}")
         
@@ -596,7 +996,7 @@ def main():
         st.header("📚 Processing History")
         
         if etl.history:
-            for record in etl.history[:8]:  # Show last 8
+            for record in islice(etl.history, 8):  # Show last 8
                 status_icon = "✅" if record['status'] == 'Success' else "❌"
                 
                 with st.expander(f"{status_icon} {record['institution']} - {record['quarter']} - {record.get('uploaded_by', 'Unknown')}"):